@@ -0,0 +1,205 @@
+"""Thread-safe storage of the events received by a tracer.
+
+This is a support module of
+:py:class:`~ska_tango_testing.integration.TangoEventTracer`, which keeps
+its received events in an :py:class:`EventStore` instance.
+"""
+
+import bisect
+import threading
+from collections import defaultdict, deque
+from typing import Callable, Sequence
+
+from .event import ReceivedEvent
+
+
+def get_event_key(event: ReceivedEvent) -> tuple[str, str]:
+    """Get the key which groups the events by their source.
+
+    :param event: The event.
+
+    :return: The device name and the (lower case) attribute name.
+    """
+    return event.device_name, event.attribute_key
+
+
+def get_source_key(
+    device_name: str | None, attribute_name: str | None
+) -> tuple[str, str] | None:
+    """Get the key of a source, as given by a query.
+
+    :param device_name: The device the events must come from.
+    :param attribute_name: The attribute the events must come from.
+
+    :return: The same key of :py:func:`get_event_key` if both the device
+        and the attribute are given, None otherwise.
+    """
+    if device_name is None or attribute_name is None:
+        return None
+    return device_name, attribute_name.lower()
+
+
+class EventStore:
+    """The (optionally bounded) collection of the received events.
+
+    The events are stored in reception order and, at the same time, grouped
+    by their source (see :py:func:`get_event_key`), so the events from a given
+    device and attribute can be accessed without scanning all of them.
+    Each stored event gets a sequence number, which never decreases (even
+    when the events are cleared or discarded).
+
+    **IMPORTANT NOTE**: all the methods are thread-safe (the events are
+    written by the event callbacks and read by the queries).
+    """
+
+    def __init__(self, max_events: int | None = None) -> None:
+        """Create an empty store.
+
+        :param max_events: An optional maximum number of stored events.
+            When the limit is reached, the oldest stored events are
+            discarded to make room for the new ones.
+        """
+        # set of received events (the oldest are discarded when
+        # the eventual maximum size is reached)
+        self._events: deque[ReceivedEvent] = deque(maxlen=max_events)
+
+        # immutable snapshot of the stored events, built when they are
+        # read and reset when they change (so repeated reads between two
+        # events don't copy them again)
+        self._snapshot: tuple[ReceivedEvent, ...] | None = None
+
+        # sequence number of the last received event
+        self._last_seq = 0
+
+        # number of events discarded because the maximum size was reached
+        self.n_discarded = 0
+
+        # the same events, grouped by device and (lower case) attribute name;
+        # each group is kept sorted by reception time, so the event that
+        # precedes a given one can be found with a binary search
+        self._events_by_key: dict[
+            tuple[str, str], list[ReceivedEvent]
+        ] = defaultdict(list)
+
+        # lock for thread safety in event handling
+        self._lock = threading.Lock()
+
+    def add(self, event: ReceivedEvent) -> int:
+        """Store an event (discarding the oldest one, if it is full).
+
+        :param event: The event to store.
+
+        :return: The sequence number of the stored event.
+        """
+        key = get_event_key(event)
+        with self._lock:
+            if len(self._events) == self._events.maxlen:
+                self._discard(self._events[0])
+                self.n_discarded += 1
+            self._events.append(event)
+            self._snapshot = None
+            self._last_seq += 1
+            # NOTE: events are usually received in order, so this is
+            # most of the times an append at the end of the group
+            bisect.insort(
+                self._events_by_key[key],
+                event,
+                key=lambda evt: evt.reception_time,
+            )
+            return self._last_seq
+
+    def snapshot(self) -> tuple[ReceivedEvent, ...]:
+        """Get a snapshot of all the stored events.
+
+        :return: An immutable snapshot of the stored events.
+        """
+        with self._lock:
+            return self._get_snapshot()
+
+    def get_events(
+        self,
+        key: tuple[str, str] | None = None,
+        on_taken: Callable[[int], None] | None = None,
+    ) -> Sequence[ReceivedEvent]:
+        """Get the stored events, narrowed to a source if it is given.
+
+        :param key: The key of the source the events must come from
+            (see :py:func:`get_source_key`), or None for all the events.
+        :param on_taken: An optional function called with the sequence
+            number of the last stored event, in the same critical section
+            in which the events are taken (so no event can be stored
+            in between, e.g., while a query becomes pending).
+
+        :return: The stored events from the given source (sorted by
+            reception time) if it is given, all the stored events otherwise.
+        """
+        with self._lock:
+            if on_taken is not None:
+                on_taken(self._last_seq)
+            if key is None:
+                return self._get_snapshot()
+            return list(self._events_by_key.get(key, ()))
+
+    def get_previous(
+        self, target_event: ReceivedEvent
+    ) -> ReceivedEvent | None:
+        """Get the stored event that precedes the given one.
+
+        :param target_event: The event whose predecessor is looked for.
+
+        :return: The most recent event from the same source received before
+            the given one, or ``None`` if there is no such event.
+        """
+        with self._lock:
+            same_source_events = self._events_by_key.get(
+                get_event_key(target_event)
+            )
+            if not same_source_events:
+                return None
+
+            # index of the first event not received before the target one
+            index = bisect.bisect_left(
+                same_source_events,
+                target_event.reception_time,
+                key=lambda evt: evt.reception_time,
+            )
+            return same_source_events[index - 1] if index > 0 else None
+
+    def clear(self) -> None:
+        """Remove all the stored events."""
+        with self._lock:
+            self._snapshot = None
+            self._events.clear()
+            self._events_by_key.clear()
+
+    def _get_snapshot(self) -> tuple[ReceivedEvent, ...]:
+        """Get the (eventually cached) snapshot of the stored events.
+
+        **IMPORTANT NOTE**: call this method holding the lock.
+
+        :return: A snapshot of the stored events.
+        """
+        if self._snapshot is None:
+            self._snapshot = tuple(self._events)
+        return self._snapshot
+
+    def _discard(self, event: ReceivedEvent) -> None:
+        """Remove a stored event from the events grouped by source.
+
+        **IMPORTANT NOTE**: call this method holding the lock.
+
+        :param event: The event to remove.
+        """
+        key = get_event_key(event)
+        same_source_events = self._events_by_key[key]
+        index = bisect.bisect_left(
+            same_source_events,
+            event.reception_time,
+            key=lambda evt: evt.reception_time,
+        )
+        # (more events may have the same reception time)
+        while same_source_events[index] is not event:
+            index += 1
+        del same_source_events[index]
+        if not same_source_events:
+            del self._events_by_key[key]
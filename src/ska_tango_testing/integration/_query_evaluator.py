@@ -0,0 +1,493 @@
+"""Evaluation of the queries on the events received by a tracer.
+
+This is a support module of
+:py:class:`~ska_tango_testing.integration.TangoEventTracer`, which
+evaluates each of its queries through a :py:class:`QueryEvaluator`
+instance and keeps the waiting ones in a :py:class:`PendingQueries`
+collection (the query parameters are validated by :py:func:`create_query`).
+"""
+
+import threading
+from itertools import chain
+from typing import Callable, Iterable, NamedTuple, SupportsFloat
+
+import tango
+
+from ._event_store import get_source_key
+from .event import ReceivedEvent
+
+# (pre-built) infinite value, to validate the timeouts
+_INF = float("inf")
+
+
+class QueryEvaluator:
+    """Tool to evaluate events and wait for a condition to be met.
+
+    This is a support class used by
+    :py:class:`~ska_tango_testing.integration.TangoEventTracer`
+    to keep track of received queries on their status.
+    An instance of this class is created each time
+    :py:meth:`ska_tango_testing.integration.TangoEventTracer.query_events`
+    is called.
+
+    Since this class encodes the query criteria (n events that satisfy a
+    predicate), it permits to:
+
+    - see if and when the query conditions are met
+      (:py:meth:`are_conditions_met`);
+    - wait for the query to be satisfied, so keep your thread locked until
+      the target conditions are met or the timeout is reached
+      (:py:meth:`wait_until_conditions_met`);
+    - evaluate events incrementally, update the query results and unlock
+      those who are waiting when the conditions are met
+      (:py:meth:`evaluate_events`);
+    - access the query result (:py:attr:`matching_events`).
+
+    **IMPORTANT NOTE:** the evaluation of events is protected by a
+    lock owned by each query, so :py:meth:`evaluate_events` can be
+    called concurrently by different threads (e.g., different event
+    callbacks) without any further lock.
+    """
+
+    def __init__(
+        self,
+        predicate: Callable[[ReceivedEvent], bool],
+        target_n_events: int = 1,
+        timeout: int | float | None = None,
+        on_conditions_met: Callable[[], None] | None = None,
+    ) -> None:
+        """Create the object specifying the query conditions.
+
+        The query conditions are specified by a predicate function
+        that selects which events satisfy some criteria, a target number
+        of events that must satisfy the predicate, and an optional timeout
+        that permits you to wait for that criteria to be satisfied.
+
+        :param predicate: A function that takes an event as input and returns
+            True if the event matches the desired criteria.
+        :param target_n_events: How many events do you expect to find with this
+            query? If in past events (events which happens prior to the moment
+            in which the query is evaluated) you don't reach the target number,
+            the method will wait till you reach the target number or you reach
+            the timeout. Defaults to 1 so in case of a waiting loop, the method
+            will return the first event.
+
+            If you set this to a number greater than 1 (**and ``timeout``
+            is not ``None``**) the method will wait until you reach the
+            target number of events that match the predicate. E.g., if you
+            set this to 10, at query time there are 4 matching events it will
+            wait for 6 more events to match the predicate. If you set this
+            to 10, at query time there are 12 matching events it will return
+            immediately all the 12 matching events.
+
+        :param timeout: The time span in seconds to wait for a matching event
+            (optional). If not specified, the method returns immediately.
+        :param on_conditions_met: An optional function called (just once)
+            when the conditions are met, in addition to the unlocking
+            of who is waiting (e.g., to notify an asyncio event loop).
+        """
+        self.predicate = predicate
+        self.target_n_events = target_n_events
+        self.timeout = timeout
+        self._on_conditions_met = on_conditions_met
+
+        # list of events that match the predicate, collected so far
+        # they are updated by the evaluate_events method by
+        # the callback of the tracer
+        self.matching_events: list[ReceivedEvent] = []
+
+        # flag set (just once) when the query is satisfied: from then on
+        # new events are no more evaluated
+        self._done = False
+
+        # condition which protects the evaluation of events (so concurrent
+        # evaluations don't interfere with each other) and which is used
+        # to make pending query_events calls wait for the query to be
+        # satisfied and then unlock them when conditions are met
+        self._query_satisfied_condition = threading.Condition()
+
+    def evaluate_events(
+        self, events: Iterable[ReceivedEvent], from_scratch: bool = False
+    ) -> None:
+        """Evaluate events incrementally and update the query results.
+
+        **IMPORTANT NOTE**: the given events are the new events to
+        evaluate (e.g., the already stored events when the query starts,
+        then each new received event), each of them is evaluated once:
+        if it matches the predicate, it is added to the
+        query results. If the query is satisfied, anything that is waiting
+        for this thread through :py:meth:`wait_until_conditions_met`
+        is unlocked. Once the query is satisfied, further calls
+        don't evaluate anything.
+
+        **IMPORTANT NOTE**: this method is thread-safe.
+
+        :param events: The list of new events to check.
+        :param from_scratch: If True, the given events are all the events
+            to check (e.g., the whole stored history) and they replace the
+            query results collected so far, instead of being added to them.
+        """
+        with self._query_satisfied_condition:
+            if self._done:
+                return
+
+            # update query results with new events that match the predicate
+            # (filter runs the loop in C, resolving the predicate just once)
+            if from_scratch:
+                self.matching_events = list(filter(self.predicate, events))
+            else:
+                self.matching_events.extend(filter(self.predicate, events))
+
+            # if the query is satisfied, unlock who is waiting
+            if self.are_conditions_met():
+                self._set_done()
+
+    def release(self) -> None:
+        """Stop the query, unlocking who is waiting for it.
+
+        The query results stay the ones collected so far and new events
+        are no more evaluated (e.g., used when the tracer is closed
+        while some queries are still waiting).
+        """
+        with self._query_satisfied_condition:
+            if not self._done:
+                self._set_done()
+
+    def _set_done(self) -> None:
+        """Mark the query as done and unlock who is waiting for it.
+
+        **IMPORTANT NOTE**: call this method holding the query condition.
+        """
+        self._done = True
+        self._query_satisfied_condition.notify_all()
+        if self._on_conditions_met is not None:
+            self._on_conditions_met()
+
+    def start(
+        self, make_pending: Callable[[], Iterable[ReceivedEvent]]
+    ) -> None:
+        """Make the query pending and evaluate the already stored events.
+
+        The given function makes the query pending (so it receives the new
+        events) and returns the events stored until then, which are
+        evaluated right after. The query lock is held all the while, so the
+        new events received in the meantime are evaluated only after the
+        stored ones (and the matching events keep their reception order).
+
+        :param make_pending: A function that makes the query pending and
+            returns the already stored events.
+        """
+        with self._query_satisfied_condition:
+            self.evaluate_events(make_pending())
+
+    def reevaluate_history(
+        self, take_events: Callable[[], Iterable[ReceivedEvent]]
+    ) -> None:
+        """Evaluate again all the events, taken holding the query lock.
+
+        The given function returns all the stored events, which replace
+        the query results collected so far (see :py:meth:`evaluate_events`).
+        The events are taken holding the query lock, so concurrent
+        evaluations are applied in the same order in which the events are
+        taken (and an older history never overwrites a newer one).
+
+        :param take_events: A function that returns the stored events.
+        """
+        with self._query_satisfied_condition:
+            self.evaluate_events(take_events(), from_scratch=True)
+
+    def are_conditions_met(self) -> bool:
+        """Check if it's reached the target number of matching events.
+
+        :return: True if the query is satisfied, False otherwise.
+        """
+        return len(self.matching_events) >= self.target_n_events
+
+    def needs_waiting(self) -> bool:
+        """Check if it's necessary to wait for new events.
+
+        :return: True if the conditions are not met yet and a (positive)
+            timeout is specified, False otherwise.
+        """
+        return (
+            self.timeout is not None
+            and self.timeout > 0
+            and not self.are_conditions_met()
+        )
+
+    def wait_until_conditions_met(self) -> None:
+        """Wait for the query conditions to be met (or the timeout).
+
+        This call will lock your thread until the query conditions are met
+        or the timeout is reached. If the query is already satisfied,
+        it will return immediately, else it will wait to reach the
+        specified :py:attr:`target_n_events` to be reached.
+
+        Events are evaluated incrementally by the
+        :py:meth:`evaluate_events` method, which is called by the tracer
+        every time a new event is received. When the conditions are met,
+        who called this method is unlocked.
+        """
+        # if no timeout is specified, or the query is already satisfied,
+        # return immediately (no need to wait)
+        if not self.needs_waiting():
+            return
+
+        with self._query_satisfied_condition:
+            self._query_satisfied_condition.wait_for(
+                lambda: self._done, self.timeout
+            )
+
+
+class PendingQuery(NamedTuple):
+    """A query which is waiting for new events, as seen by the tracer."""
+
+    evaluator: QueryEvaluator
+    """The query itself."""
+
+    source_key: tuple[str, str] | None
+    """The key of the source the query is restricted to (if any)."""
+
+    start_seq: int
+    """The sequence number of the last event stored before the query
+    started (the events up to it are evaluated when the query starts,
+    so they must not be evaluated again when received)."""
+
+    reevaluates_history: bool
+    """If True, each new event triggers the evaluation of all the stored
+    events (from the query source), instead of just the new one."""
+
+
+class PendingQueries:
+    """The collection of the queries which are waiting for new events.
+
+    The pending queries are grouped by the (device, lower case attribute)
+    source they are restricted to (None for the queries which may match
+    events from any source), so an event is dispatched only to the queries
+    that may match it; in each group the queries are keyed by their id,
+    so they can be removed in constant time.
+
+    **IMPORTANT NOTE**: the changes to the collection are serialized by a
+    lock (the queries lock), but the dictionaries are never modified in
+    place: they are replaced by an updated copy (copy-on-write), so the
+    event callbacks can read them without acquiring any lock.
+    """
+
+    def __init__(self) -> None:
+        """Create an empty collection."""
+        self._queries: dict[
+            tuple[str, str] | None, dict[int, PendingQuery]
+        ] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        """Count the pending queries (lock-free).
+
+        :return: The number of pending queries.
+        """
+        return sum(len(queries) for queries in self._queries.values())
+
+    def add(self, pending_query: PendingQuery) -> None:
+        """Add a pending query (thread-safe).
+
+        :param pending_query: The pending query to add.
+        """
+        source_key = pending_query.source_key
+        with self._lock:
+            self._queries = {
+                **self._queries,
+                source_key: {
+                    **self._queries.get(source_key, {}),
+                    id(pending_query.evaluator): pending_query,
+                },
+            }
+
+    def remove(self, pending_query: PendingQuery) -> None:
+        """Remove a pending query, if it is still there (thread-safe).
+
+        :param pending_query: The pending query to remove.
+        """
+        source_key = pending_query.source_key
+        with self._lock:
+            group = dict(self._queries.get(source_key, {}))
+            if group.pop(id(pending_query.evaluator), None) is None:
+                return
+
+            queries = dict(self._queries)
+            if group:
+                queries[source_key] = group
+            else:
+                del queries[source_key]
+            self._queries = queries
+
+    def get_candidates(
+        self, event_key: tuple[str, str]
+    ) -> Iterable[PendingQuery]:
+        """Get the pending queries that may match an event (lock-free).
+
+        :param event_key: The key of the event source.
+
+        :return: The queries restricted to the event source and the
+            unrestricted ones.
+        """
+        # (the dictionary is replaced, never modified, so it is taken once)
+        queries = self._queries
+
+        # most of the times no query is waiting
+        if not queries:
+            return ()
+        return chain(
+            queries.get(event_key, {}).values(),
+            queries.get(None, {}).values(),
+        )
+
+    def release_all(self) -> None:
+        """Release all the pending queries, so they stop waiting."""
+        for queries in self._queries.values():
+            for pending_query in queries.values():
+                pending_query.evaluator.release()
+
+
+def create_query(
+    predicate: Callable[[ReceivedEvent], bool],
+    timeout: SupportsFloat | None,
+    target_n_events: int,
+    device_name: "str | tango.DeviceProxy | None",
+    attribute_name: str | None,
+    on_conditions_met: Callable[[], None] | None = None,
+) -> tuple[QueryEvaluator, tuple[str, str] | None]:
+    """Validate the query parameters and create the query.
+
+    The parameters are the ones of
+    :py:meth:`~ska_tango_testing.integration.TangoEventTracer.query_events`.
+
+    :param predicate: A function that takes an event as input and returns
+        True if the event matches the desired criteria.
+    :param timeout: The time span in seconds to wait for a matching event.
+    :param target_n_events: How many events do you expect to find with
+        this query.
+    :param device_name: The device the events must come from (if any).
+    :param attribute_name: The attribute the events must come from
+        (if any).
+    :param on_conditions_met: An optional function called when the
+        query is satisfied (see :py:class:`QueryEvaluator`).
+
+    :return: The query and the key of the source it is restricted to
+        (None if it is not restricted to a single source).
+
+    :raises ValueError: If the timeout or the target number of events
+        does not meet the requirements (see above).
+    """  # noqa: DAR402
+    # pylint: disable=too-many-arguments
+
+    # validate the timeout and the target number of events
+    # and raise a ValueError if they are not correct
+    timeout = validate_timeout(timeout)
+    target_n_events = validate_target_n_events(target_n_events)
+
+    if isinstance(device_name, tango.DeviceProxy):
+        device_name = device_name.dev_name()
+    query_evaluator = QueryEvaluator(
+        restrict_to_source(predicate, device_name, attribute_name),
+        target_n_events,
+        timeout,
+        on_conditions_met=on_conditions_met,
+    )
+    return query_evaluator, get_source_key(device_name, attribute_name)
+
+
+def restrict_to_source(
+    predicate: Callable[[ReceivedEvent], bool],
+    device_name: str | None,
+    attribute_name: str | None,
+) -> Callable[[ReceivedEvent], bool]:
+    """Restrict a predicate to the events from a given source.
+
+    :param predicate: The predicate to restrict.
+    :param device_name: The device the events must come from.
+    :param attribute_name: The attribute the events must come from.
+
+    :return: A predicate that checks the source of the event before
+        (and instead of, if the source doesn't match) evaluating the
+        given predicate. If no source is given, the predicate itself.
+    """
+    if device_name is None and attribute_name is None:
+        return predicate
+
+    def _source_predicate(event: ReceivedEvent) -> bool:
+        """Check the event source, then the given predicate.
+
+        :param event: The event to evaluate.
+
+        :return: True if the event comes from the given source and
+            matches the given predicate.
+        """
+        return (
+            (device_name is None or event.device_name == device_name)
+            and (attribute_name is None or event.has_attribute(attribute_name))
+            and predicate(event)
+        )
+
+    return _source_predicate
+
+
+def validate_timeout(timeout: SupportsFloat | None) -> float | None:
+    """Validate the timeout and return it as a float.
+
+    A timeout can be None or something that can be casted to a float. If
+    it is something that can be casted to a float, it must be greater than
+    0, not infinite and not NaN. This method performs these checks and
+    returns the timeout as a float (or None).
+
+    :param timeout: The timeout to validate.
+    :return: The timeout as a float.
+    :raises ValueError: If some of the stated conditions are not met.
+    """
+    if timeout is None:
+        return None
+
+    # (most of the times the timeout is already a float)
+    if not isinstance(timeout, float):
+        timeout = float(timeout)
+
+    if timeout < 0:
+        raise ValueError(
+            "The timeout must be greater than 0. "
+            f"Instead, you provided {timeout}."
+        )
+
+    if timeout == _INF:
+        raise ValueError(
+            "The timeout must not be infinite. "
+            "Instead, you provided float('inf') or something "
+            "that when casted as float turns to become "
+            "float('inf')."
+        )
+
+    # (NaN is the only value which is not equal to itself)
+    if timeout != timeout:  # pylint: disable=comparison-with-itself
+        raise ValueError(
+            "The timeout must be a number. Instead, you provided NaN "
+            "or something that when casted as float turns to become NaN."
+        )
+
+    return timeout
+
+
+def validate_target_n_events(target_n_events: int) -> int:
+    """Validate the target number of events and return it as an int.
+
+    The target number of events must be greater or equal to 1. This method
+    performs this check and returns the target number of events as an int.
+
+    :param target_n_events: The target number of events to validate.
+    :return: The target number of events as an int.
+    :raises ValueError: If the target number of events is less than 1.
+    """
+    if target_n_events < 1:
+        raise ValueError(
+            "The target number of events must be greater or equal to 1. "
+            f"Instead, you provided {target_n_events}."
+        )
+
+    return target_n_events
@@ -93,6 +93,7 @@ from ska_tango_testing.integration.event import ReceivedEvent
 
 from .predicates import (
     ANY_VALUE,
+    _check_source_names,
     event_has_previous_value,
     event_matches_parameters,
 )
@@ -129,10 +130,10 @@ def _get_tracer(assertpy_context: Any) -> TangoEventTracer:
 
 
 def _print_passed_event_args(
-    device_name: str | None = ANY_VALUE,
-    attribute_name: str | None = ANY_VALUE,
-    attribute_value: Any | None = ANY_VALUE,
-    previous_value: Any | None = ANY_VALUE,
+    device_name: str = ANY_VALUE,
+    attribute_name: str = ANY_VALUE,
+    attribute_value: Any = ANY_VALUE,
+    previous_value: Any = ANY_VALUE,
     custom_matcher: Callable[[ReceivedEvent], bool] | None = None,
     target_n_events: int = 1,
 ) -> str:
@@ -257,10 +258,10 @@ def within_timeout(assertpy_context: Any, timeout: int | float) -> Any:
 
 def has_change_event_occurred(
     assertpy_context: Any,
-    device_name: str | None = ANY_VALUE,
-    attribute_name: str | None = ANY_VALUE,
-    attribute_value: Any | None = ANY_VALUE,
-    previous_value: Any | None = ANY_VALUE,
+    device_name: str = ANY_VALUE,
+    attribute_name: str = ANY_VALUE,
+    attribute_value: Any = ANY_VALUE,
+    previous_value: Any = ANY_VALUE,
     custom_matcher: Callable[[ReceivedEvent], bool] | None = None,
     min_n_events: int = 1,
 ) -> Any:
@@ -350,12 +351,17 @@ def has_change_event_occurred(
         :py:class:`~ska_tango_testing.integration.TangoEventTracer`
         instance is not found (i.e., the method is called outside
         an ``assert_that(tracer)`` context).
+    :raises TypeError: If the device or the attribute name is ``None``
+        (to match any device or attribute, don't pass them).
     """  # noqa: DAR402
     # pylint: disable=too-many-arguments
 
     # check assertpy_context has a tracer object
     tracer = _get_tracer(assertpy_context)
 
+    # check the source names before querying (a None name is a mistake)
+    _check_source_names(device_name, attribute_name)
+
     # quick trick: if device_name is a device proxy, get the name
     if isinstance(device_name, tango.DeviceProxy):
         device_name = device_name.dev_name()
@@ -395,6 +401,9 @@ def has_change_event_occurred(
         target_n_events=min_n_events,
         # if given use the timeout, else None
         timeout=timeout_util.get_remaining_timeout() if timeout_util else None,
+        # if given, narrow the query to the events from the given source
+        device_name=None if device_name is ANY_VALUE else device_name,
+        attribute_name=None if attribute_name is ANY_VALUE else attribute_name,
     )
 
     # if not enough events are found, raise an error
@@ -429,10 +438,10 @@ def has_change_event_occurred(
 
 def hasnt_change_event_occurred(
     assertpy_context: Any,
-    device_name: str | None = ANY_VALUE,
-    attribute_name: str | None = ANY_VALUE,
-    attribute_value: Any | None = ANY_VALUE,
-    previous_value: Any | None = ANY_VALUE,
+    device_name: str = ANY_VALUE,
+    attribute_name: str = ANY_VALUE,
+    attribute_value: Any = ANY_VALUE,
+    previous_value: Any = ANY_VALUE,
     custom_matcher: Callable[[ReceivedEvent], bool] | None = None,
     max_n_events: int = 1,
 ) -> Any:
@@ -490,12 +499,17 @@ def hasnt_change_event_occurred(
         :py:class:`~ska_tango_testing.integration.TangoEventTracer`
         instance is not found (i.e., the method is called outside
         an ``assert_that(tracer)`` context).
+    :raises TypeError: If the device or the attribute name is ``None``
+        (to match any device or attribute, don't pass them).
     """  # noqa: DAR402
     # pylint: disable=too-many-arguments
 
     # check assertpy_context has a tracer object
     tracer = _get_tracer(assertpy_context)
 
+    # check the source names before querying (a None name is a mistake)
+    _check_source_names(device_name, attribute_name)
+
     # quick trick: if device_name is a device proxy, get the name
     if isinstance(device_name, tango.DeviceProxy):
         device_name = device_name.dev_name()
@@ -535,6 +549,9 @@ def hasnt_change_event_occurred(
         target_n_events=max_n_events,
         # if given use the timeout, else None
         timeout=timeout_util.get_remaining_timeout() if timeout_util else None,
+        # if given, narrow the query to the events from the given source
+        device_name=None if device_name is ANY_VALUE else device_name,
+        attribute_name=None if attribute_name is ANY_VALUE else attribute_name,
     )
 
     # if enough events are found, raise an error
@@ -1,10 +1,14 @@
 """A Tango change event received by some device to notify a change."""
 
+import sys
 from datetime import datetime
 from typing import Any
 
 import tango
 
+# pre-resolved reference, used on the (hot) attribute name comparison path
+_lower = str.lower
+
 
 class ReceivedEvent:
     """A Tango change event received by some device to notify a change.
@@ -46,6 +50,13 @@ class ReceivedEvent:
         # Further data
         self.reception_time = datetime.now()
 
+        # names read from the event data (and interned) when first needed;
+        # they are cached "by hand" because functools.cached_property
+        # would serialise the first access of all the events on a lock
+        self._device_name: str | None = None
+        self._attribute_name: str | None = None
+        self._attribute_key: str | None = None
+
     def __str__(self) -> str:
         """Return a string representation of the event.
 
@@ -75,9 +86,15 @@ class ReceivedEvent:
 
         Example: 'sys/tg_test/1'
 
+        **NOTE**: the name is read from the event data just once and then
+        it is interned, so comparisons between names of events from the
+        same device are (most of the times) identity checks.
+
         :return: The name of the device.
         """
-        return self.event_data.device.dev_name()
+        if self._device_name is None:
+            self._device_name = sys.intern(self.event_data.device.dev_name())
+        return self._device_name
 
     @property
     def attribute_name(self) -> str:
@@ -103,9 +120,16 @@ class ReceivedEvent:
 
         :return: The name of the attribute.
         """
-        return self.event_data.attr_name.split("/")[-1].replace(
-            "#dbase=no", ""
-        )
+        # NOTE: the full name is something like
+        # 'tango://host:port/dev/ice/name/attr#dbase=no', so we take
+        # just what follows the last '/' and drop the (eventual) suffix
+        if self._attribute_name is None:
+            self._attribute_name = sys.intern(
+                self.event_data.attr_name.rpartition("/")[2].removesuffix(
+                    "#dbase=no"
+                )
+            )
+        return self._attribute_name
         # TODO: Why if instead we use the following line, it occasionally
         # fails with a segmentation fault? Is event_data not a copy?
         # return self.event_data.attr_value.name
@@ -170,9 +194,20 @@ class ReceivedEvent:
 
         :return: True if the event comes from the given attribute.
         """
-        return str.lower(self.attribute_name) == str.lower(
-            target_attribute_name
-        )
+        return self.attribute_key == _lower(target_attribute_name)
+
+    @property
+    def attribute_key(self) -> str:
+        """The lower case attribute name, computed once per event.
+
+        It's the attribute name to use when you need to group or compare
+        events by attribute regardless of the case.
+
+        :return: The lower case name of the attribute.
+        """
+        if self._attribute_key is None:
+            self._attribute_key = sys.intern(_lower(self.attribute_name))
+        return self._attribute_key
 
     def reception_age(self) -> float:
         """Return the age of the event in seconds since it was received.
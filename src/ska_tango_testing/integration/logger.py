@@ -264,7 +264,10 @@ class TangoEventLogger:
 
             :param event_data: The received event data.
             """
-            self._log_event(event_data, filtering_rule, message_builder)
+            # the event is wrapped just once and then passed along
+            self._log_event(
+                ReceivedEvent(event_data), filtering_rule, message_builder
+            )
 
         # subscribe to the change event
         sub_id = device_proxy.subscribe_event(
@@ -277,7 +280,7 @@ class TangoEventLogger:
 
     def _log_event(
         self,
-        event_data: tango.EventData,
+        event: ReceivedEvent,
         filtering_rule: Callable[[ReceivedEvent], bool],
         message_builder: Callable[[ReceivedEvent], str],
     ) -> None:
@@ -287,12 +290,10 @@ class TangoEventLogger:
         method checks if the event passes the filter and if it does, it uses
         the message builder to generate the log message and log it.
 
-        :param event_data: The received event data.
+        :param event: The received event.
         :param filtering_rule: The filtering rule to apply.
         :param message_builder: The message builder to use.
         """
-        event = ReceivedEvent(event_data)
-
         # the event may be typed with an Enum
         event = self.attribute_enum_mapping.get_typed_event(event)
 
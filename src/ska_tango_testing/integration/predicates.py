@@ -22,19 +22,64 @@ import tango  # pylint: disable=unused-import
 from .event import ReceivedEvent
 from .tracer import TangoEventTracer
 
-ANY_VALUE = None
+
+class _AnyValue:  # pylint: disable=too-few-public-methods
+    """Type of the ``ANY_VALUE`` sentinel."""
+
+    def __repr__(self) -> str:
+        """Return the name of the sentinel.
+
+        :return: the sentinel name.
+        """
+        return "ANY_VALUE"
+
+
+ANY_VALUE: Any = _AnyValue()
+"""Sentinel to mark a criterion as not given (any value will match).
+
+It is a unique object (and not ``None``) so it can be compared by
+identity and ``None`` remains available as a legit value to match.
+"""
+
+
+def _check_source_names(device_name: Any, attribute_name: Any) -> None:
+    """Check that the given device and attribute names are not ``None``.
+
+    ``None`` is a legit value to match only for the attribute values:
+    device and attribute names are strings, so a ``None`` name is
+    surely a mistake (to match any name, don't pass it or pass
+    ``ANY_VALUE``).
+
+    :param device_name: The device name (or ``ANY_VALUE``).
+    :param attribute_name: The attribute name (or ``ANY_VALUE``).
+
+    :raises TypeError: If the device or the attribute name is ``None``.
+    """
+    if device_name is None:
+        raise TypeError(
+            "The device name must not be None. To match any device, "
+            "don't pass it (or pass ANY_VALUE)."
+        )
+    if attribute_name is None:
+        raise TypeError(
+            "The attribute name must not be None. To match any attribute, "
+            "don't pass it (or pass ANY_VALUE)."
+        )
 
 
 def event_matches_parameters(
     target_event: ReceivedEvent,
-    device_name: "str | tango.DeviceProxy | None" = ANY_VALUE,
-    attribute_name: str | None = ANY_VALUE,
-    attribute_value: Any | None = ANY_VALUE,
+    device_name: "str | tango.DeviceProxy" = ANY_VALUE,
+    attribute_name: str = ANY_VALUE,
+    attribute_value: Any = ANY_VALUE,
 ) -> bool:
     """Check if an event matches the provided criteria.
 
     If a criterion is not given (``ANY_VALUE``), the predicate will always
-    return True (only the given and not ``None`` criteria will be checked).
+    return True (only the given criteria will be checked). Since
+    ``ANY_VALUE`` is not ``None``, you can also use ``None`` as an
+    attribute value to match (device and attribute names can't be
+    ``None``).
 
     :param target_event: The event to check.
     :param device_name: The device name to match. If not provided, it will
@@ -45,7 +90,12 @@ def event_matches_parameters(
         it will match any current value.
 
     :return: True if the event matches the provided criteria, False otherwise.
-    """
+
+    :raises TypeError: If the device or the attribute name is ``None``
+        (only the attribute value can be ``None``).
+    """  # noqa: DAR402
+    _check_source_names(device_name, attribute_name)
+
     # if provided, check if device name matches the criteria
     # (else any device name will match)
     if device_name is not ANY_VALUE and not target_event.has_device(
@@ -90,26 +140,9 @@ def event_has_previous_value(
         if the event has no previous value or if the previous value does
         not match.
     """
-    previous_event = None
-
     # If any, get the previous event for the same device and attribute
     # than the current event
-
-    for evt in tracer.events:
-        if (
-            # the event is from the same device and attribute
-            # and is previous to the target event
-            evt.has_device(target_event.device_name)
-            and evt.has_attribute(target_event.attribute_name)
-            and evt.reception_time < target_event.reception_time
-        ):
-            if (
-                # if no previous event was found or the current one
-                # is more recent than the previous one
-                previous_event is None
-                or evt.reception_time > previous_event.reception_time
-            ):
-                previous_event = evt
+    previous_event = tracer.get_previous_event(target_event)
 
     # If no previous event was found, return False (there is no event
     # before the target one, so none with the expected previous value)
@@ -14,149 +14,31 @@ assertions
 (:py:mod:`ska_tango_testing.integration.assertions`).
 """
 
+import asyncio
 import logging
 import threading
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from enum import Enum
-from typing import Callable, SupportsFloat
+from functools import partial
+from typing import Callable, Iterable, Sequence, SupportsFloat
 
 import tango
 
 import ska_tango_testing.context
 
+from ._event_store import EventStore, get_event_key
+from ._query_evaluator import (
+    PendingQueries,
+    PendingQuery,
+    QueryEvaluator,
+    create_query,
+)
 from .event import ReceivedEvent
 from .typed_event import EventEnumMapper
 
-
-class _QueryEvaluator:
-    """Tool to evaluate events and wait for a condition to be met.
-
-    This is a support class used by
-    :py:class:`~ska_tango_testing.integration.TangoEventTracer`
-    to keep track of received queries on their status.
-    An instance of this class is created each time
-    :py:meth:`ska_tango_testing.integration.TangoEventTracer.query_events`
-    is called.
-
-    Since this class encodes the query criteria (n events that satisfy a
-    predicate), it permits to:
-
-    - see if and when the query conditions are met
-      (:py:meth:`are_conditions_met`);
-    - wait for the query to be satisfied, so keep your thread locked until
-      the target conditions are met or the timeout is reached
-      (:py:meth:`wait_until_conditions_met`);
-    - evaluate events incrementally, update the query results and unlock
-      those who are waiting when the conditions are met
-      (:py:meth:`evaluate_events`);
-    - access the query result (:py:attr:`matching_events`).
-
-    **IMPORTANT NOTE:** this class is not thread-safe by itself, but it
-    can be if your calls to :py:meth:`evaluate_events` are protected by
-    a lock. The class is used by the tracer, which does that.
-    """
-
-    def __init__(
-        self,
-        predicate: Callable[[ReceivedEvent], bool],
-        target_n_events: int = 1,
-        timeout: int | float | None = None,
-    ) -> None:
-        """Create the object specifying the query conditions.
-
-        The query conditions are specified by a predicate function
-        that selects which events satisfy some criteria, a target number
-        of events that must satisfy the predicate, and an optional timeout
-        that permits you to wait for that criteria to be satisfied.
-
-        :param predicate: A function that takes an event as input and returns
-            True if the event matches the desired criteria.
-        :param target_n_events: How many events do you expect to find with this
-            query? If in past events (events which happens prior to the moment
-            in which the query is evaluated) you don't reach the target number,
-            the method will wait till you reach the target number or you reach
-            the timeout. Defaults to 1 so in case of a waiting loop, the method
-            will return the first event.
-
-            If you set this to a number greater than 1 (**and ``timeout``
-            is not ``None``**) the method will wait until you reach the
-            target number of events that match the predicate. E.g., if you
-            set this to 10, at query time there are 4 matching events it will
-            wait for 6 more events to match the predicate. If you set this
-            to 10, at query time there are 12 matching events it will return
-            immediately all the 12 matching events.
-
-        :param timeout: The time span in seconds to wait for a matching event
-            (optional). If not specified, the method returns immediately.
-        """
-        self.predicate = predicate
-        self.target_n_events = target_n_events
-        self.timeout = timeout
-
-        # list of events that match the predicate, collected so far
-        # they are updated by the evaluate_events method by
-        # the callback of the tracer
-        self.matching_events: list[ReceivedEvent] = []
-
-        # tool to signal that the query is satisfied, it is used to make
-        # pending query_events calls wait for the query to be satisfied
-        # and then unlock them when conditions are met
-        self._query_satisfied_signal = threading.Event()
-
-    def evaluate_events(self, events: list[ReceivedEvent]) -> None:
-        """Evaluate events incrementally and update the query results.
-
-        **IMPORTANT NOTE**: every time a new event is received,
-        if it matches the predicate
-        (and is not already in the query results), it is added to the
-        query results. If the query is satisfied, anything that is waiting
-        for this thread through :py:meth:`wait_until_conditions_met`
-        is unlocked.
-
-        **IMPORTANT NOTE**: this method is not thread-safe by itself,
-        but it can be if protected by the caller with a lock.
-
-        :param events: The list of new events to check.
-        """
-        # update query results with new events that match the predicate
-        for event in events:
-            if self.predicate(event) and event not in self.matching_events:
-                self.matching_events.append(event)
-
-        # if the query is satisfied, unlock who is waiting
-        if self.are_conditions_met():
-            self._query_satisfied_signal.set()
-
-    def are_conditions_met(self) -> bool:
-        """Check if it's reached the target number of matching events.
-
-        :return: True if the query is satisfied, False otherwise.
-        """
-        return len(self.matching_events) >= self.target_n_events
-
-    def wait_until_conditions_met(self) -> None:
-        """Wait for the query conditions to be met (or the timeout).
-
-        This call will lock your thread until the query conditions are met
-        or the timeout is reached. If the query is already satisfied,
-        it will return immediately, else it will wait to reach the
-        specified :py:attr:`target_n_events` to be reached.
-
-        Events are evaluated incrementally by the
-        :py:meth:`evaluate_events` method, which is called by the tracer
-        every time a new event is received. When the conditions are met,
-        who called this method is unlocked.
-        """
-        # if no timeout is specified, or the query is already satisfied,
-        # return immediately (no need to wait)
-        if (
-            self.timeout is None
-            or self.timeout <= 0
-            or self.are_conditions_met()
-        ):
-            return
-
-        self._query_satisfied_signal.wait(self.timeout)
+# maximum number of devices unsubscribed concurrently
+_MAX_UNSUBSCRIBE_WORKERS = 8
 
 
 class TangoEventTracer:
@@ -187,18 +69,23 @@ class TangoEventTracer:
 
         def test_attribute_change():
 
-            tracer = TangoEventTracer()
-            tracer.subscribe_event("sys/tg_test/1", "State")
+            with TangoEventTracer() as tracer:
+                tracer.subscribe_event("sys/tg_test/1", "State")
 
-            # do something that triggers the event
-            # ...
+                # do something that triggers the event
+                # ...
+
+                assert len(tracer.query_events(
+                    lambda e:
+                        e.has_device("sys/tg_test/1") and
+                        e.has_attribute("State") and
+                        e.current_value == TARGET_STATE,
+                    timeout=10)) == 1
 
-            assert len(tracer.query_events(
-                lambda e:
-                    e.has_device("sys/tg_test/1") and
-                    e.has_attribute("State") and
-                    e.current_value == TARGET_STATE,
-                timeout=10)) == 1
+    The tracer is closed (i.e., it unsubscribes from all the subscriptions
+    and clears the events) when the ``with`` block ends. If you don't use
+    it as a context manager, call :py:meth:`close` explicitly when you
+    don't need it anymore (e.g., in the teardown of a fixture).
 
     Queries are a powerful tool to make assertions on specific complex
     behaviours of a device. For example, you may want to check that
@@ -308,38 +195,63 @@ class TangoEventTracer:
     The queries with timeouts are implemented by creating a sort of
     "pending query" object and waiting for its conditions to be satisfied
     through a signal. The pending queries are updated every time a new
-    event happens and, when the conditions are met, the signal is set
-    and the waiting thread is unlocked. Since the queries are accessed
+    event happens (just the ones that may match it, if the queries are
+    restricted to a source) and, when the conditions are met, the signal
+    is set and the waiting thread is unlocked. Since the queries are accessed
     asynchronously by the main test thread and by the various callbacks,
-    a further lock to protect them is added.
+    a further lock to protect them is added (the lock serializes just the
+    changes to the collection of pending queries, which is replaced by an
+    updated copy at each change, so the callbacks read it without any lock
+    and evaluate a new event with each query protecting its own
+    evaluation).
     A third (not essential) lock is used to protect the
     subscriptions, so they can potentially
     be created and deleted from different
     threads (it is not a primary use case, but it is technically possible).
 
     *To prevent the risk of deadlock we purposely avoided the acquiring of two
-    locks together (in each point of the code it is acquired at most one
-    of the three locks). To prevent the risk of infinite signal waits, when a
-    wait happen, it's ensured that it has been specified a timeout. Moreover,
-    waits don't ever keep locks. For now, locks aren't reentrant, so if you
-    modify this code be careful to not acquire a lock that you already have.*
+    locks together, with just one exception: when a query starts, holding its
+    own lock it acquires the events lock (the lock of the event store) and then
+    the queries lock (the lock of the pending queries, so it becomes pending in
+    the same critical section in which the stored events are taken); in the
+    same way, a query which re-evaluates the history takes the stored events
+    holding its own lock. The opposite order never happens. Events are
+    evaluated by the queries (and so by the predicates) without holding any of
+    the tracer locks. To prevent the risk of infinite signal waits, when a wait
+    happen, it's ensured that it has been specified a timeout. Moreover, waits
+    don't ever keep locks. For now, locks aren't reentrant, so if you modify
+    this code be careful to not acquire a lock that you already have.*
     """
 
     def __init__(
-        self, event_enum_mapping: dict[str, type[Enum]] | None = None
+        self,
+        event_enum_mapping: dict[str, type[Enum]] | None = None,
+        max_events: int | None = None,
     ):
         """Initialize the event collection and the lock.
 
         :param event_enum_mapping: An optional mapping of attribute names
             to enums (to handle typed events).
+        :param max_events: An optional maximum number of stored events.
+            When the limit is reached, the oldest stored events are
+            discarded to make room for the new ones (so the memory
+            stays bounded in long-running tests). By default, there
+            is no limit.
+
+        :raises ValueError: If the maximum number of events is not
+            a positive integer.
         """
-        # set of received events
-        self._events: list[ReceivedEvent] = []
+        if max_events is not None and max_events <= 0:
+            raise ValueError(
+                "The maximum number of events must be a positive integer. "
+                f"Got {max_events}."
+            )
 
-        # lock for thread safety in event handling
-        # (events are read by queries and written by the event callback
-        # of the subscriptions => they must be protected)
-        self._events_lock = threading.Lock()
+        # received events (the oldest are discarded when the eventual
+        # maximum size is reached); events are read by queries and written
+        # by the event callback of the subscriptions => the store is
+        # thread-safe, protected by its own lock (the events lock)
+        self._event_store = EventStore(max_events)
 
         # dictionary of subscription ids (foreach device proxy
         # are stored the subscription ids of the subscribed attributes)
@@ -355,47 +267,146 @@ class TangoEventTracer:
         # even this to make the class entirely thread-safe)
         self._subscriptions_lock = threading.Lock()
 
-        # list of pending queries
-        self._pending_queries: list[_QueryEvaluator] = []
+        # pending queries (they are accessed by the main test thread - to
+        # create new queries - and by the event callback - to update the
+        # queries and unlock them => the collection is thread-safe)
+        self._pending_queries = PendingQueries()
 
-        # lock for pending queries
-        # (the query list and the queries are accessed by the main
-        # test thread - to create new
-        # queries - and by the event callback - to update the queries
-        # and unlock them => they must be protected)
-        self._query_lock = threading.Lock()
+        # optional filter applied to the raw received events, before
+        # they are wrapped and stored
+        self._prefilter: Callable[[tango.EventData], bool] | None = None
 
         # mapping of attribute names to enums (to handle typed events)
         self.attribute_enum_mapping: EventEnumMapper = EventEnumMapper(
             event_enum_mapping
         )
 
-    def __del__(self) -> None:
-        """Teardown the object and unsubscribe from all subscriptions."""
+    def __enter__(self) -> "TangoEventTracer":
+        """Use the tracer as a context manager (closed on exit).
+
+        :return: The tracer itself.
+        """
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        """Close the tracer when exiting the context.
+
+        :param exc_info: The (eventual) exception information.
+        """
+        self.close()
+
+    def close(self) -> None:
+        """Teardown the tracer: unsubscribe from all and clear the events.
+
+        Call this method (or use the tracer as a context manager) when
+        you don't need the tracer anymore, so the subscriptions are
+        removed explicitly in the calling thread. Queries still waiting
+        in other threads are released, returning the events they
+        matched so far instead of waiting for their timeout.
+        """
         self.unsubscribe_all()
+        self._pending_queries.release_all()
         self.clear_events()
 
     # #############################
     # Access to stored events
 
     @property
-    def events(self) -> list[ReceivedEvent]:
-        """A copy of the currently stored events (thread-safe).
+    def events(self) -> tuple[ReceivedEvent, ...]:
+        """A snapshot of the currently stored events (thread-safe).
+
+        The snapshot is an immutable tuple, so it can be shared between
+        repeated reads until a new event is stored (if you need a list
+        you can modify, use ``list(tracer.events)``).
 
-        :return: A copy of the stored events.
+        :return: A snapshot of the stored events.
         """  # noqa: D402
-        with self._events_lock:
-            return self._events.copy()
+        return self._event_store.snapshot()
+
+    @property
+    def n_discarded_events(self) -> int:
+        """How many events have been discarded to respect ``max_events``.
+
+        It is always 0 if the tracer has no maximum number of events.
+        A positive value means the oldest events are no more available
+        to queries (e.g., you may want to log it or to increase the limit).
+
+        :return: The number of discarded events.
+        """
+        return self._event_store.n_discarded
 
     def clear_events(self) -> None:
         """Clear all stored events."""
-        with self._events_lock:
-            self._events.clear()
+        self._event_store.clear()
+
+    def get_previous_event(
+        self, target_event: ReceivedEvent
+    ) -> ReceivedEvent | None:
+        """Get the stored event that precedes the given one (thread-safe).
+
+        The previous event is the most recent stored event that comes from
+        the same device and attribute as the given one and that has been
+        received before it (according to
+        :py:attr:`~ska_tango_testing.integration.event.ReceivedEvent.reception_time`).
+
+        :param target_event: The event whose predecessor is looked for.
+
+        :return: The previous event, or ``None`` if there is no such event.
+        """  # pylint: disable=line-too-long # noqa: E501
+        return self._event_store.get_previous(target_event)
 
     # #############################
     # Subscription and
     # event handling
 
+    def set_prefilter(
+        self, prefilter: Callable[[tango.EventData], bool] | None
+    ) -> None:
+        """Set a filter that decides which received events are stored.
+
+        The filter is applied to the raw :py:class:`tango.EventData`
+        as soon as an event is received, before it is wrapped in a
+        :py:class:`~ska_tango_testing.integration.event.ReceivedEvent`,
+        stored and evaluated by the pending queries. The events
+        rejected by the filter are just dropped, so they are never
+        returned by the queries.
+
+        This is useful when you subscribe to chatty attributes but you
+        care just about a subset of their events: the rejected events
+        cost nothing more than the filter evaluation.
+
+        Usage example:
+
+        .. code-block:: python
+
+            # store just the events with a positive value
+            tracer.set_prefilter(lambda data: data.attr_value.value > 0)
+
+        :param prefilter: A function that takes the received event data
+            and returns True if the event must be stored. Pass ``None``
+            to remove the current filter.
+        """
+        self._prefilter = prefilter
+
+    def inject_event(self, event: ReceivedEvent) -> None:
+        """Store an event as if it was received from a subscription.
+
+        The event is stored and evaluated by the pending queries exactly
+        like the received ones, but without any Tango subscription (and
+        without the prefilter, which works on the raw Tango event data).
+        This is meant for tests, where synthetic events can be pushed
+        directly into the tracer.
+
+        Usage example:
+
+        .. code-block:: python
+
+            tracer.inject_event(ReceivedEvent(fake_event_data))
+
+        :param event: The event to store.
+        """
+        self._add_event(event)
+
     def subscribe_event(
         self,
         device_name: "str | tango.DeviceProxy",
@@ -453,6 +464,41 @@ class TangoEventTracer:
         :raises ValueError: If the device_name is not a string or a
             DeviceProxy.
         """  # noqa: DAR402
+        self.subscribe_events(device_name, [attribute_name], dev_factory)
+
+    def subscribe_events(
+        self,
+        device_name: "str | tango.DeviceProxy",
+        attribute_names: Iterable[str],
+        dev_factory: Callable[[str], tango.DeviceProxy] | None = None,
+    ) -> None:
+        """Subscribe to change events for many attributes of a Tango device.
+
+        It's the same as calling :py:meth:`subscribe_event` for each
+        attribute, but the device proxy is resolved just once and the
+        subscription ids are stored all together.
+
+        Usage example:
+
+        .. code-block:: python
+
+            tracer.subscribe_events("sys/tg_test/1", ["State", "obsState"])
+
+        :param device_name: The name of the Tango target device. Alternatively,
+            if you already have a device proxy, you can pass it directly.
+        :param attribute_names: The names of the attributes to subscribe to
+            (a single name given as a string is treated as a list with
+            just that name, not as a sequence of characters).
+        :param dev_factory: A device factory method to get the device proxy.
+            If not specified, the device proxy is created using the
+            default constructor :py:class:`tango.DeviceProxy`.
+
+        :raises tango.DevFailed: If a subscription fails (the subscriptions
+            made before the failing one are kept). See
+            :py:meth:`subscribe_event` for the common reasons.
+        :raises ValueError: If the device_name is not a string or a
+            DeviceProxy.
+        """  # noqa: DAR402
         if isinstance(device_name, str):
             dev_factory = (
                 dev_factory or ska_tango_testing.context.DeviceProxy
@@ -467,16 +513,27 @@ class TangoEventTracer:
                 f"{type(device_name)}."
             )
 
-        # subscribe to the change event
-        sub_id = device_proxy.subscribe_event(
-            attribute_name,
-            tango.EventType.CHANGE_EVENT,
-            self._event_callback,
-        )
+        # a string is an iterable of strings too, but here it is
+        # surely meant as the name of a single attribute
+        if isinstance(attribute_names, str):
+            attribute_names = [attribute_names]
 
-        # store the subscription id
-        with self._subscriptions_lock:
-            self._subscription_ids[device_proxy].append(sub_id)
+        # subscribe to the change events
+        sub_ids: list[int] = []
+        try:
+            for attribute_name in attribute_names:
+                sub_ids.append(
+                    device_proxy.subscribe_event(
+                        attribute_name,
+                        tango.EventType.CHANGE_EVENT,
+                        self._event_callback,
+                    )
+                )
+        finally:
+            # store the subscription ids (even if a subscription failed,
+            # the ones already made must be unsubscribed later)
+            with self._subscriptions_lock:
+                self._subscription_ids[device_proxy].extend(sub_ids)
 
     def _event_callback(self, event: tango.EventData) -> None:
         """Capture the received events and store them.
@@ -492,8 +549,11 @@ class TangoEventTracer:
             return
 
         try:
+            if self._prefilter is not None and not self._prefilter(event):
+                return
+
             self._add_event(ReceivedEvent(event))
-        except BaseException as exception:  # pylint: disable=broad-except
+        except Exception as exception:  # pylint: disable=broad-except
             logging.error("Error while processing event: %s", exception)
 
     def _add_event(self, event: ReceivedEvent) -> None:
@@ -501,45 +561,103 @@ class TangoEventTracer:
 
         :param event: The event to add.
         """
-        # event may be typed
-        event = self.attribute_enum_mapping.get_typed_event(event)
+        # event may be typed (if any attribute is mapped to an enum)
+        if not self.attribute_enum_mapping.is_empty():
+            event = self.attribute_enum_mapping.get_typed_event(event)
 
         # append the event to the list of stored events
-        with self._events_lock:
-            self._events.append(event)
-            events_now = self._events.copy()
+        event_seq = self._event_store.add(event)
 
         # logging.info("Trying unlocking %s pending queries.",
         #              str(len(self._pending_queries)))
 
-        # update all pending queries
-        with self._query_lock:
-            for query in self._pending_queries:
-                # NOTE: since some old not matching events potentially
-                # can become matching when new events are added (e.g.,
-                # if the predicate includes a condition like "has this other
-                # event as next") we re-evaluate all the events. We could
-                # choose as policy that each event is evaluated only once,
-                # but currently we are not doing that.
-
-                # NOTE: queries that reach the target number of events
-                # are unlocked as a side effect of the evaluation
-                query.evaluate_events(events_now)
+        # update the pending queries that may match the event, i.e.,
+        # the ones restricted to its source and the unrestricted ones
+        # (the already satisfied queries are skipped, even if they are
+        # still pending until their waiting thread removes them, and so
+        # are the queries that started after this event was stored,
+        # since they already evaluated it). The pending queries are read
+        # without acquiring any lock: this is safe, because a query becomes
+        # pending in the same critical section (under the events lock) in
+        # which it takes the stored events: if it is not pending yet, it
+        # will find this event among the stored ones, if it is pending
+        # already, it is here (and this event is newer than its start)
+        for pending_query in self._pending_queries.get_candidates(
+            get_event_key(event)
+        ):
+            query = pending_query.evaluator
+            if (
+                pending_query.start_seq >= event_seq
+                or query.are_conditions_met()
+            ):
+                continue
+
+            # NOTE: queries that reach the target number of events
+            # are unlocked as a side effect of the evaluation
+            if pending_query.reevaluates_history:
+                # (opt-in) the predicate may depend on later events,
+                # so the whole stored history is evaluated again
+                query.reevaluate_history(
+                    partial(
+                        self._event_store.get_events, pending_query.source_key
+                    )
+                )
+            else:
+                # NOTE: each event is evaluated just once per query:
+                # past events are evaluated when the query starts, new
+                # events when they are received. So here we evaluate just
+                # the new event (and not again the whole stored history).
+                query.evaluate_events([event])
 
     def unsubscribe_all(self) -> None:
-        """Unsubscribe from all subscriptions."""
+        """Unsubscribe from all subscriptions.
+
+        The subscriptions of different devices are removed concurrently,
+        since each unsubscription is a round-trip to the device.
+        """
+        # take the subscriptions out, so the lock is not kept
+        # during the (potentially slow) unsubscriptions
         with self._subscriptions_lock:
-            for device_proxy, device_sub_ids in self._subscription_ids.items():
-                for subscription_id in device_sub_ids:
-                    try:
-                        device_proxy.unsubscribe_event(subscription_id)
-                    except tango.DevFailed as dev_failed_exception:
-                        logging.warning(
-                            "Error while unsubscribing from event: %s",
-                            dev_failed_exception,
-                        )
+            subscriptions = list(self._subscription_ids.items())
             self._subscription_ids.clear()
 
+        if len(subscriptions) <= 1:
+            for device_proxy, device_sub_ids in subscriptions:
+                self._unsubscribe_device(device_proxy, device_sub_ids)
+            return
+
+        with ThreadPoolExecutor(
+            max_workers=min(len(subscriptions), _MAX_UNSUBSCRIBE_WORKERS)
+        ) as executor:
+            futures = [
+                executor.submit(
+                    self._unsubscribe_device, device_proxy, device_sub_ids
+                )
+                for device_proxy, device_sub_ids in subscriptions
+            ]
+
+        # propagate any unexpected error
+        for future in futures:
+            future.result()
+
+    @staticmethod
+    def _unsubscribe_device(
+        device_proxy: tango.DeviceProxy, subscription_ids: list[int]
+    ) -> None:
+        """Unsubscribe from the given subscriptions of a device.
+
+        :param device_proxy: The device proxy.
+        :param subscription_ids: The ids of the subscriptions to remove.
+        """
+        for subscription_id in subscription_ids:
+            try:
+                device_proxy.unsubscribe_event(subscription_id)
+            except tango.DevFailed as dev_failed_exception:
+                logging.warning(
+                    "Error while unsubscribing from event: %s",
+                    dev_failed_exception,
+                )
+
     # #############################
     # Querying stored
     # and future events
@@ -549,6 +667,9 @@ class TangoEventTracer:
         predicate: Callable[[ReceivedEvent], bool],
         timeout: SupportsFloat | None = None,
         target_n_events: int = 1,
+        device_name: "str | tango.DeviceProxy | None" = None,
+        attribute_name: str | None = None,
+        reevaluates_history: bool = False,
     ) -> list[ReceivedEvent]:
         """Query stored and future events with a predicate and a timeout.
 
@@ -598,11 +719,20 @@ class TangoEventTracer:
                 timeout=10
             )
 
+        If you already know the device and/or the attribute of the events
+        you are looking for, pass them through ``device_name`` and
+        ``attribute_name``: the events from other sources are skipped
+        without evaluating the predicate and, when both are given, just
+        the stored events from that source are evaluated when the
+        query starts.
+
         To write good queries you have to understand the predicate mechanism.
         The predicate can be as complex as you want, and inside it you can
         also access the list of stored events using :py:attr:`events`.
         Don't worry, everything is thread-safe and this will make you evaluate
-        always the most updated list of events. See
+        always the most updated list of events. Each event is evaluated
+        just once per query: the already stored events when the query
+        starts, the new ones as soon as they are received. See
         :py:mod:`ska_tango_testing.integration.predicates`
         for good examples of predicates.
         See also the
@@ -622,7 +752,7 @@ class TangoEventTracer:
 
             A timeout can be None or something that can be casted to a float.
             If it is something that can be casted to a float, it must be
-            greater than 0 and not infinite.
+            greater than 0, not infinite and not NaN.
 
             **TECHNICAL NOTE**: Timeout may non be always a number but
             something that can be casted to a float. This is useful for
@@ -648,108 +778,218 @@ class TangoEventTracer:
 
             It must be greater or equal to 1.
 
+        :param device_name: The device the events must come from
+            (optional). If not specified, events from any device
+            are evaluated.
+        :param attribute_name: The attribute the events must come from
+            (optional, case insensitive). If not specified, events from
+            any attribute are evaluated.
+        :param reevaluates_history: By default, each event is evaluated
+            with the predicate just once (the stored events when the query
+            starts, the new ones when they are received). If your predicate
+            result for an event may change when later events are received
+            (e.g., "an event A followed by an event B", where A is matched
+            only after B is received), set this to True: every time a new
+            event is received, all the stored events (from the given
+            source, if any) are evaluated again.
+
         :return: all matching events within the timeout
             period if there are any, or an empty list if there are none.
 
         :raises ValueError: If the timeout or the target number of events
             does not meet the requirements (see above).
         """  # noqa: DAR402
-        # validate the timeout and the target number of events
-        # and raise a ValueError if they are not correct
-        timeout = self._validate_timeout(timeout)
-        target_n_events = self._validate_target_n_events(target_n_events)
+        # pylint: disable=too-many-arguments
 
         # we aim to get a certain target number of events
         # that match a predicate
         # within a certain timeout
-        query_evaluator = _QueryEvaluator(predicate, target_n_events, timeout)
-        query_evaluator.evaluate_events(self.events)
+        query_evaluator, source_key = create_query(
+            predicate, timeout, target_n_events, device_name, attribute_name
+        )
 
-        # if the query is already satisfied, return the matching events
-        if query_evaluator.are_conditions_met():
+        # if the query is already satisfied (or there is nothing
+        # to wait), return the matching events
+        pending_query = self._start_query(
+            query_evaluator, source_key, reevaluates_history
+        )
+        if pending_query is None:
             return query_evaluator.matching_events
 
         # logging.info("Waiting for query to be satisfied.")
 
         # wait for the query to be satisfied
-        # (add it to the list of pending queries)
-        self._wait_query(query_evaluator)
+        self._wait_query(pending_query)
 
         # return the result (whatever it is)
         return query_evaluator.matching_events
 
-    def _wait_query(self, query_evaluator: _QueryEvaluator) -> None:
-        """Wait for a query to be satisfied in a thread-safe way.
+    async def query_events_async(
+        self,
+        predicate: Callable[[ReceivedEvent], bool],
+        timeout: SupportsFloat | None = None,
+        target_n_events: int = 1,
+        device_name: "str | tango.DeviceProxy | None" = None,
+        attribute_name: str | None = None,
+        reevaluates_history: bool = False,
+    ) -> list[ReceivedEvent]:
+        """Query stored and future events, waiting in an asyncio event loop.
 
-        The query is marked as pending and then waited for. When the query
-        is satisfied or a timeout is reached, the query is unlocked
-        and the process continues.
+        This is the coroutine version of :py:meth:`query_events`, with
+        the same parameters and semantics. The difference is that the
+        wait doesn't block the calling thread: the event loop is
+        notified as soon as the query is satisfied, so many queries can
+        be awaited concurrently without a thread for each of them.
 
-        :param query_evaluator: The query object to wait for.
-        """
-        # add the query to the list of pending queries
-        with self._query_lock:
-            self._pending_queries.append(query_evaluator)
+        Usage example:
 
-        # wait for the query to be satisfied (or the timeout to be reached)
-        query_evaluator.wait_until_conditions_met()
+        .. code-block:: python
 
-        # remove the query from the list of pending queries
-        with self._query_lock:
-            self._pending_queries.remove(query_evaluator)
+            events = await tracer.query_events_async(
+                lambda e: e.has_device("sys/tg_test/1") and
+                          e.has_attribute("State"),
+                timeout=10
+            )
 
-    # -----------------------------
-    # Input validators
+        :param predicate: A function that takes an event as input and returns
+            True if the event matches the desired criteria.
+        :param timeout: The time span in seconds to wait for a matching event
+            (optional). If not specified, the method returns immediately.
+            See :py:meth:`query_events` for the accepted values.
+        :param target_n_events: How many events do you expect to find with this
+            query? See :py:meth:`query_events` for further details.
+        :param device_name: The device the events must come from
+            (optional).
+        :param attribute_name: The attribute the events must come from
+            (optional, case insensitive).
+        :param reevaluates_history: If True, all the stored events are
+            evaluated again every time a new event is received (for
+            predicates that depend on later events).
+            See :py:meth:`query_events` for further details.
 
-    @staticmethod
-    def _validate_timeout(timeout: SupportsFloat | None) -> float | None:
-        """Validate the timeout and return it as a float.
+        :return: all matching events within the timeout
+            period if there are any, or an empty list if there are none.
 
-        A timeout can be None or something that can be casted to a float. If
-        it is something that can be casted to a float, it must be greater than
-        0 and not infinite. This method performs these checks and returns the
-        timeout as a float (or None).
+        :raises ValueError: If the timeout or the target number of events
+            does not meet the requirements (see :py:meth:`query_events`).
+        """  # noqa: DAR402
+        # pylint: disable=too-many-arguments
+
+        # the event callbacks run in Tango threads, so they notify the
+        # event loop in a thread-safe way
+        loop = asyncio.get_running_loop()
+        conditions_met = asyncio.Event()
+
+        def _notify_loop() -> None:
+            """Set the asyncio event from whatever thread."""
+            try:
+                loop.call_soon_threadsafe(conditions_met.set)
+            except RuntimeError:
+                # the event loop is already closed, nobody is waiting
+                pass
+
+        query_evaluator, source_key = create_query(
+            predicate,
+            timeout,
+            target_n_events,
+            device_name,
+            attribute_name,
+            on_conditions_met=_notify_loop,
+        )
+
+        pending_query = self._start_query(
+            query_evaluator, source_key, reevaluates_history
+        )
+        if pending_query is None:
+            return query_evaluator.matching_events
 
-        :param timeout: The timeout to validate.
-        :return: The timeout as a float.
-        :raises ValueError: If some of the stated conditions are not met.
+        try:
+            await asyncio.wait_for(
+                conditions_met.wait(), query_evaluator.timeout
+            )
+        except asyncio.TimeoutError:
+            pass
+        finally:
+            self._pending_queries.remove(pending_query)
+
+        return query_evaluator.matching_events
+
+    def _start_query(
+        self,
+        query_evaluator: QueryEvaluator,
+        source_key: tuple[str, str] | None = None,
+        reevaluates_history: bool = False,
+    ) -> PendingQuery | None:
+        """Evaluate the stored events and, if needed, make the query pending.
+
+        The query is made pending in the same critical section in which
+        the stored events are taken (so that any new event is either among
+        the stored events or is evaluated by the event callback, which
+        finds the query pending). Then the stored events are evaluated,
+        before any new event (see :py:meth:`QueryEvaluator.start`), and,
+        if the query is already satisfied, it is no more pending.
+
+        :param query_evaluator: The query to start.
+        :param source_key: The key of the source the query is restricted
+            to, if any (just the stored events from that source are
+            evaluated).
+        :param reevaluates_history: If True, the stored events are evaluated
+            again at each new event (see :py:meth:`query_events`).
+
+        :return: The pending query, which must be waited for, or None if
+            the query is already satisfied (or there is nothing to wait).
         """
-        if timeout is None:
+        # a query without a timeout will never be pending, so it just
+        # evaluates the stored events
+        if not query_evaluator.timeout:
+            query_evaluator.evaluate_events(
+                self._event_store.get_events(source_key)
+            )
             return None
 
-        timeout = float(timeout)
+        pending_query: PendingQuery | None = None
 
-        if timeout < 0:
-            raise ValueError(
-                "The timeout must be greater than 0. "
-                f"Instead, you provided {timeout}."
+        def _make_pending(start_seq: int) -> None:
+            """Make the query pending (holding the events lock).
+
+            :param start_seq: The sequence number of the last stored event.
+            """
+            nonlocal pending_query
+            pending_query = PendingQuery(
+                query_evaluator, source_key, start_seq, reevaluates_history
             )
+            self._pending_queries.add(pending_query)
 
-        if timeout == float("inf"):
-            raise ValueError(
-                "The timeout must not be infinite. "
-                "Instead, you provided float('inf') or something "
-                "that when casted as float turns to become "
-                "float('inf')."
+        def _take_stored_events() -> Sequence[ReceivedEvent]:
+            """Make the query pending and take the stored events.
+
+            :return: The events stored before the query became pending.
+            """
+            return self._event_store.get_events(
+                source_key, on_taken=_make_pending
             )
 
-        return timeout
+        query_evaluator.start(_take_stored_events)
+        assert pending_query is not None
+        if query_evaluator.needs_waiting():
+            return pending_query
 
-    @staticmethod
-    def _validate_target_n_events(target_n_events: int) -> int:
-        """Validate the target number of events and return it as an int.
+        self._pending_queries.remove(pending_query)
+        return None
 
-        The target number of events must be greater or equal to 1. This method
-        performs this check and returns the target number of events as an int.
+    def _wait_query(self, pending_query: PendingQuery) -> None:
+        """Wait for a pending query to be satisfied in a thread-safe way.
 
-        :param target_n_events: The target number of events to validate.
-        :return: The target number of events as an int.
-        :raises ValueError: If the target number of events is less than 1.
-        """
-        if target_n_events < 1:
-            raise ValueError(
-                "The target number of events must be greater or equal to 1. "
-                f"Instead, you provided {target_n_events}."
-            )
+        The (already pending) query is waited for. When the query
+        is satisfied or a timeout is reached, the query is unlocked,
+        removed from the pending queries and the process continues.
 
-        return target_n_events
+        :param pending_query: The pending query to wait for.
+        """
+        try:
+            # wait for the query to be satisfied (or the timeout to be reached)
+            pending_query.evaluator.wait_until_conditions_met()
+        finally:
+            # remove the query from the pending queries (even if the wait
+            # is interrupted, e.g., by a KeyboardInterrupt)
+            self._pending_queries.remove(pending_query)
@@ -81,6 +81,9 @@ class TypedEvent(ReceivedEvent):
         _fail_if_type_not_enum(enum_class)
         self.enum_class = enum_class
 
+        # attribute value converted to the enum (when first read)
+        self._typed_value: Enum | None = None
+
     @property
     def attribute_value(self) -> Enum:
         """The attribute value, eventually casted to the given enum.
@@ -103,10 +106,14 @@ class TypedEvent(ReceivedEvent):
             print(event.attribute_value) # 1
             print(str(event.attribute_value))  # MyEnum.STATE1
 
+        **NOTE**: the value is converted to the enum just once, when it
+        is first read (predicates may read it many times).
+
         :return: the attribute value, eventually converted to an enum.
         """
-        attr_value = super().attribute_value
-        return self.enum_class(attr_value)
+        if self._typed_value is None:
+            self._typed_value = self.enum_class(super().attribute_value)
+        return self._typed_value
 
 
 class EventEnumMapper:
@@ -159,11 +166,12 @@ class EventEnumMapper:
 
         :raises TypeError: if any of the values in the mapping is not an Enum.
         """  # noqa: DAR402
-        self._mapping = mapping if mapping is not None else {}
+        # NOTE: the attribute names are stored in lower case, so the
+        # enum of an event is found with a single (case insensitive) lookup
+        self._mapping: dict[str, type[Enum]] = {}
 
-        # Check that all the values in the mapping are Enums
-        for enum_class in self._mapping.values():
-            _fail_if_type_not_enum(enum_class)
+        for attribute_name, enum_class in (mapping or {}).items():
+            self.map_attribute_to_enum(attribute_name, enum_class)
 
     def map_attribute_to_enum(
         self, attribute_name: str, enum_class: type[Enum]
@@ -176,7 +184,14 @@ class EventEnumMapper:
         :raises TypeError: if enum_class is not an Enum.
         """  # noqa: DAR402
         _fail_if_type_not_enum(enum_class)
-        self._mapping[attribute_name] = enum_class
+        self._mapping[attribute_name.lower()] = enum_class
+
+    def is_empty(self) -> bool:
+        """Check if no attribute is associated with an Enum.
+
+        :return: True if there are no associations, False otherwise.
+        """
+        return not self._mapping
 
     def get_typed_event(self, event: ReceivedEvent) -> ReceivedEvent:
         """Get a ``TypedEvent`` if the attribute is associated with an Enum.
@@ -186,8 +201,14 @@ class EventEnumMapper:
             :py:class:`TypedEvent` instance if the attribute is
             associated with an Enum, the original event otherwise.
         """
-        for attr_name, enum_class in self._mapping.items():
-            # NOTE: We use the has_attribute method to avoid case sensitivity
-            if event.has_attribute(attr_name):
-                return TypedEvent(event.event_data, enum_class)
-        return event
+        if not self._mapping:
+            return event
+
+        enum_class = self._mapping.get(event.attribute_name.lower())
+        if enum_class is None:
+            return event
+
+        typed_event = TypedEvent(event.event_data, enum_class)
+        # the typed event is the same event, received at the same time
+        typed_event.reception_time = event.reception_time
+        return typed_event
@@ -1,14 +1,17 @@
 """Fixtures for the `TangoEventTracer` unit tests."""
 
+from typing import Generator
+
 import pytest
 
 from ska_tango_testing.integration.tracer import TangoEventTracer
 
 
 @pytest.fixture
-def tracer() -> TangoEventTracer:
+def tracer() -> Generator[TangoEventTracer, None, None]:
     """Create a `TangoEventTracer` instance for testing.
 
-    :return: a `TangoEventTracer` instance.
+    :yield: a `TangoEventTracer` instance (closed after the test).
     """
-    return TangoEventTracer()
+    with TangoEventTracer() as event_tracer:
+        yield event_tracer
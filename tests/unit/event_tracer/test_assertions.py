@@ -228,6 +228,27 @@ class TestCustomAssertions:
                 attribute_value=100,
             )
 
+    @staticmethod
+    @pytest.mark.parametrize(
+        "assertion_name",
+        ["has_change_event_occurred", "hasnt_change_event_occurred"],
+    )
+    @pytest.mark.parametrize("source", ["device_name", "attribute_name"])
+    def test_assertions_reject_none_source_names(
+        tracer: TangoEventTracer, assertion_name: str, source: str
+    ) -> None:
+        """A None device or attribute name is rejected with a clear error.
+
+        :param tracer: The `TangoEventTracer` instance.
+        :param assertion_name: The name of the custom assertion.
+        :param source: The name of the parameter set to None.
+        """
+        add_event(tracer, "device1", 100, attr_name="attrname")
+        assertion = getattr(assert_that(tracer), assertion_name)
+
+        with pytest.raises(TypeError, match="must not be None"):
+            assertion(**{source: None})
+
     def test_assert_that_event_occurred_fails_when_no_event_within_timeout(
         self,
         tracer: TangoEventTracer,
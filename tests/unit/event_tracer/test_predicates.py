@@ -3,12 +3,12 @@
 Ensure that the custom predicates for the :py:class:`TangoEventTracer` work
 as expected, matching the correct events and values.
 """
+from typing import Any
 from unittest.mock import MagicMock
 
 import pytest
 import tango
 from assertpy import assert_that
-from pytest import fixture
 
 from ska_tango_testing.integration.predicates import (
     event_has_previous_value,
@@ -27,17 +27,17 @@ class TestCustomPredicates:
     as expected, matching the correct events and values.
     """
 
-    @fixture
     @staticmethod
-    def tracer() -> MagicMock:
-        """Mock a tracer with an empty and accessible list of events.
+    def _store_events(
+        tracer: TangoEventTracer, events: list[MagicMock]
+    ) -> None:
+        """Store some (dummy) events in the tracer.
 
-        :return: A mocked `TangoEventTracer` with a writable empty
-            list of events.
+        :param tracer: The tracer where the events are stored.
+        :param events: The events to store.
         """
-        tracer = MagicMock(spec=TangoEventTracer)
-        tracer.events = []
-        return tracer
+        for event in events:
+            tracer.inject_event(event)
 
     # #######################################################
     # Tests for the build_previous_value_predicate function
@@ -104,22 +104,59 @@ class TestCustomPredicates:
             "field does not match."
         ).is_false()
 
+    @staticmethod
+    def test_predicate_event_predicate_can_match_none_value() -> None:
+        """``None`` is a value to match, not a synonym of ``ANY_VALUE``."""
+        event_with_none = create_dummy_event("test/device/1", "attr1", None)
+        event_with_value = create_dummy_event("test/device/1", "attr1", 10)
+
+        assert_that(
+            event_matches_parameters(
+                target_event=event_with_none, attribute_value=None
+            )
+        ).described_as(
+            "The event should match the predicate if its value is None."
+        ).is_true()
+        assert_that(
+            event_matches_parameters(
+                target_event=event_with_value, attribute_value=None
+            )
+        ).described_as(
+            "The event should not match the predicate if its value is not "
+            "None and None is the expected value."
+        ).is_false()
+
+    @staticmethod
+    @pytest.mark.parametrize("source", ["device_name", "attribute_name"])
+    def test_predicate_event_predicate_rejects_none_source_names(
+        source: str,
+    ) -> None:
+        """``None`` is not a valid device or attribute name to match.
+
+        :param source: The name of the parameter set to None.
+        """
+        event = create_dummy_event("test/device/1", "attr1", None)
+        none_source: dict[str, Any] = {source: None}
+
+        with pytest.raises(TypeError, match="must not be None"):
+            event_matches_parameters(target_event=event, **none_source)
+
     # #######################################################
     # Tests for the build_previous_value_predicate function
 
     @staticmethod
     def test_predicate_previous_value_predicate_matches(
-        tracer: MagicMock,
+        tracer: TangoEventTracer,
     ) -> None:
         """An event matches the predicate if the previous value matches.
 
-        :param tracer: A mock TangoEventTracer.
+        :param tracer: The TangoEventTracer.
         """
         event = create_dummy_event("test/device/1", "attr1", 10)
         prev_event = create_dummy_event(
             "test/device/1", "attr1", 5, seconds_ago=2
         )
-        tracer.events = [prev_event, event]
+        TestCustomPredicates._store_events(tracer, [prev_event, event])
 
         assert_that(
             event_has_previous_value(
@@ -132,17 +169,17 @@ class TestCustomPredicates:
 
     @staticmethod
     def test_predicate_previous_value_predicate_does_not_match(
-        tracer: MagicMock,
+        tracer: TangoEventTracer,
     ) -> None:
         """An event matches the predicate if the previous value does not match.
 
-        :param tracer: A mock TangoEventTracer.
+        :param tracer: The TangoEventTracer.
         """
         event = create_dummy_event("test/device/1", "attr1", 10)
         prev_event = create_dummy_event(
             "test/device/1", "attr1", 5, seconds_ago=2
         )
-        tracer.events = [prev_event, event]
+        TestCustomPredicates._store_events(tracer, [prev_event, event])
 
         assert_that(
             event_has_previous_value(
@@ -155,15 +192,15 @@ class TestCustomPredicates:
 
     @staticmethod
     def test_predicate_previous_value_predicate_no_previous_event(
-        tracer: MagicMock,
+        tracer: TangoEventTracer,
     ) -> None:
         """An event doesn't match the predicate if there is no previous event.
 
-        :param tracer: A mock TangoEventTracer.
+        :param tracer: The TangoEventTracer.
         """
         event = create_dummy_event("test/device/1", "attr1", 10)
 
-        tracer.events = [event]
+        TestCustomPredicates._store_events(tracer, [event])
 
         assert_that(
             event_has_previous_value(
@@ -176,18 +213,25 @@ class TestCustomPredicates:
         ).is_false()
 
     @staticmethod
-    def test_predicate_previous_uses_most_recent(tracer: MagicMock) -> None:
+    def test_predicate_previous_uses_most_recent(
+        tracer: TangoEventTracer,
+    ) -> None:
         """An event previous value is the most recent of the past events.
 
-        :param tracer: A mock TangoEventTracer.
+        :param tracer: The TangoEventTracer.
         """
         event = create_dummy_event("test/device/1", "attr1", 10)
 
-        tracer.events = [
-            create_dummy_event("test/device/1", "attr1", 5, seconds_ago=10),
-            create_dummy_event("test/device/1", "attr1", 7, seconds_ago=8),
-            event,
-        ]
+        TestCustomPredicates._store_events(
+            tracer,
+            [
+                create_dummy_event(
+                    "test/device/1", "attr1", 5, seconds_ago=10
+                ),
+                create_dummy_event("test/device/1", "attr1", 7, seconds_ago=8),
+                event,
+            ],
+        )
 
         assert_that(
             event_has_previous_value(
@@ -200,18 +244,23 @@ class TestCustomPredicates:
 
     @staticmethod
     def test_predicate_previous_doesnt_use_future_events(
-        tracer: MagicMock,
+        tracer: TangoEventTracer,
     ) -> None:
         """An event previous value should not be from future events.
 
-        :param tracer: A mock TangoEventTracer.
+        :param tracer: The TangoEventTracer.
         """
         event = create_dummy_event("test/device/1", "attr1", 10)
 
-        tracer.events = [
-            event,
-            create_dummy_event("test/device/1", "attr1", 5, seconds_ago=-1),
-        ]
+        TestCustomPredicates._store_events(
+            tracer,
+            [
+                event,
+                create_dummy_event(
+                    "test/device/1", "attr1", 5, seconds_ago=-1
+                ),
+            ],
+        )
 
         assert_that(
             event_has_previous_value(
@@ -223,18 +272,21 @@ class TestCustomPredicates:
 
     @staticmethod
     def test_predicate_previous_doesnt_use_other_devices(
-        tracer: MagicMock,
+        tracer: TangoEventTracer,
     ) -> None:
         """An event previous value should not be from other devices.
 
-        :param tracer: A mock TangoEventTracer.
+        :param tracer: The TangoEventTracer.
         """
         event = create_dummy_event("test/device/1", "attr1", 10)
 
-        tracer.events = [
-            create_dummy_event("test/device/2", "attr1", 5, seconds_ago=1),
-            event,
-        ]
+        TestCustomPredicates._store_events(
+            tracer,
+            [
+                create_dummy_event("test/device/2", "attr1", 5, seconds_ago=1),
+                event,
+            ],
+        )
 
         assert_that(
             event_has_previous_value(
@@ -246,18 +298,21 @@ class TestCustomPredicates:
 
     @staticmethod
     def test_predicate_previous_doesnt_use_other_attributes(
-        tracer: MagicMock,
+        tracer: TangoEventTracer,
     ) -> None:
         """An event previous value should not be from other attributes.
 
-        :param tracer: A mock TangoEventTracer.
+        :param tracer: The TangoEventTracer.
         """
         event = create_dummy_event("test/device/1", "attr1", 10)
 
-        tracer.events = [
-            create_dummy_event("test/device/1", "attr2", 5, seconds_ago=1),
-            event,
-        ]
+        TestCustomPredicates._store_events(
+            tracer,
+            [
+                create_dummy_event("test/device/1", "attr2", 5, seconds_ago=1),
+                event,
+            ],
+        )
 
         assert_that(
             event_has_previous_value(
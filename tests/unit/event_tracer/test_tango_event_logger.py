@@ -16,6 +16,7 @@ import tango
 from assertpy import assert_that
 
 from ska_tango_testing.integration import log_events
+from ska_tango_testing.integration.event import ReceivedEvent
 from ska_tango_testing.integration.logger import (
     DEFAULT_LOG_ALL_EVENTS,
     DEFAULT_LOG_MESSAGE_BUILDER,
@@ -60,7 +61,7 @@ class TestTangoEventLogger:
         mock_event = create_eventdata_mock("test/device/1", "attribute1", 123)
 
         logger._log_event(  # pylint: disable=protected-access
-            event_data=mock_event,
+            event=ReceivedEvent(mock_event),
             filtering_rule=DEFAULT_LOG_ALL_EVENTS,
             message_builder=DEFAULT_LOG_MESSAGE_BUILDER,
         )
@@ -94,7 +95,7 @@ class TestTangoEventLogger:
         mock_event = create_eventdata_mock("test/device/1", "attribute1", 123)
 
         logger._log_event(  # pylint: disable=protected-access
-            event_data=mock_event,
+            event=ReceivedEvent(mock_event),
             filtering_rule=lambda e: False,
             message_builder=DEFAULT_LOG_MESSAGE_BUILDER,
         )
@@ -118,7 +119,7 @@ class TestTangoEventLogger:
         mock_event = create_eventdata_mock("test/device/1", "attribute1", 123)
 
         logger._log_event(  # pylint: disable=protected-access
-            event_data=mock_event,
+            event=ReceivedEvent(mock_event),
             filtering_rule=DEFAULT_LOG_ALL_EVENTS,
             message_builder=lambda e: "Custom message",
         )
@@ -148,7 +149,7 @@ class TestTangoEventLogger:
         )
 
         logger._log_event(  # pylint: disable=protected-access
-            event_data=mock_event,
+            event=ReceivedEvent(mock_event),
             filtering_rule=DEFAULT_LOG_ALL_EVENTS,
             message_builder=DEFAULT_LOG_MESSAGE_BUILDER,
         )
@@ -281,7 +282,7 @@ class TestTangoEventLogger:
         logger = TangoEventLogger({"State": DummyStateEnum})
 
         logger._log_event(  # pylint: disable=protected-access
-            event_data=mock_event,
+            event=ReceivedEvent(mock_event),
             filtering_rule=DEFAULT_LOG_ALL_EVENTS,
             message_builder=DEFAULT_LOG_MESSAGE_BUILDER,
         )
@@ -321,7 +322,7 @@ class TestTangoEventLogger:
             "test/device/1", "state", DummyStateEnum.STATE_1
         )
         logger._log_event(  # pylint: disable=protected-access
-            event_data=mock_event,
+            event=ReceivedEvent(mock_event),
             filtering_rule=DEFAULT_LOG_ALL_EVENTS,
             message_builder=DEFAULT_LOG_MESSAGE_BUILDER,
         )
@@ -10,6 +10,8 @@ those events correctly. For that, see `test_tracer_subscribe_event.py`.
 """
 
 # import logging
+import threading
+import time
 from datetime import datetime
 from typing import Any, SupportsFloat
 from unittest.mock import patch
@@ -23,7 +25,10 @@ from ska_tango_testing.integration.event import ReceivedEvent
 from ska_tango_testing.integration.tracer import TangoEventTracer
 
 from .testing_utils import create_eventdata_mock
-from .testing_utils.dev_proxy_mock import DeviceProxyMock
+from .testing_utils.dev_proxy_mock import (
+    DeviceProxyMock,
+    create_dev_proxy_mock,
+)
 from .testing_utils.dummy_state_enum import DummyStateEnum
 from .testing_utils.patch_context_devproxy import patch_context_device_proxy
 from .testing_utils.populate_tracer import add_event, delayed_add_event
@@ -316,6 +321,19 @@ class TestTangoEventTracer:
             "within 5 seconds, but none was found."
         ).is_length(1)
 
+    @staticmethod
+    @pytest.mark.parametrize("timeout", [-1, float("inf"), float("nan")])
+    def test_query_events_rejects_invalid_timeout(
+        tracer: TangoEventTracer, timeout: float
+    ) -> None:
+        """The query rejects negative, infinite and NaN timeouts.
+
+        :param tracer: The `TangoEventTracer` instance.
+        :param timeout: The invalid timeout.
+        """
+        with pytest.raises(ValueError):
+            tracer.query_events(lambda e: True, timeout=timeout)
+
     @staticmethod
     def test_query_events_accepts_floatable_timeout(
         tracer: TangoEventTracer,
@@ -477,3 +495,222 @@ class TestTangoEventTracer:
         assert_that(str(tracer.events[0].attribute_value)).described_as(
             "The attribute value as string should be 'STATE2'"
         ).is_equal_to("DummyStateEnum.STATE_2")
+
+
+@pytest.mark.integration_tracer
+class TestTangoEventTracerSubscriptions:
+    """Unit tests for the `TangoEventTracer` multiple subscriptions."""
+
+    @staticmethod
+    def test_subscribe_events(tracer: TangoEventTracer) -> None:
+        """Subscribe to many attributes of a device at once.
+
+        :param tracer: The `TangoEventTracer` instance.
+        """
+        device_name = "test_device"
+        attribute_names = ["attr1", "attr2", "attr3"]
+
+        with patch_context_device_proxy() as mock_proxy:
+            tracer.subscribe_events(device_name, attribute_names)
+
+            mock_proxy.assert_called_once_with(device_name)
+            assert_that(
+                mock_proxy.return_value.subscribe_event.call_count
+            ).described_as(
+                "Expected a subscription for each attribute"
+            ).is_equal_to(
+                len(attribute_names)
+            )
+            for attribute_name in attribute_names:
+                mock_proxy.return_value.subscribe_event.assert_any_call(
+                    attribute_name,
+                    tango.EventType.CHANGE_EVENT,
+                    tracer._event_callback,  # pylint: disable=protected-access
+                )
+
+    @staticmethod
+    def test_subscribe_events_with_a_single_name(
+        tracer: TangoEventTracer,
+    ) -> None:
+        """A single attribute name is not split into characters.
+
+        :param tracer: The `TangoEventTracer` instance.
+        """
+        with patch_context_device_proxy() as mock_proxy:
+            tracer.subscribe_events("test_device", "State")
+
+            mock_proxy.return_value.subscribe_event.assert_called_once_with(
+                "State",
+                tango.EventType.CHANGE_EVENT,
+                tracer._event_callback,  # pylint: disable=protected-access
+            )
+
+    @staticmethod
+    def test_unsubscribe_all(tracer: TangoEventTracer) -> None:
+        """Unsubscribe from all the subscriptions of many devices.
+
+        :param tracer: The `TangoEventTracer` instance.
+        """
+        device_proxies = {
+            name: create_dev_proxy_mock(name)
+            for name in ["device1", "device2", "device3"]
+        }
+        for device_proxy in device_proxies.values():
+            device_proxy.subscribe_event.side_effect = [1, 2]
+            tracer.subscribe_events(
+                device_proxy.dev_name(),
+                ["attr1", "attr2"],
+                dev_factory=device_proxies.__getitem__,
+            )
+
+        tracer.unsubscribe_all()
+
+        for device_proxy in device_proxies.values():
+            assert_that(
+                [
+                    call.args
+                    for call in device_proxy.unsubscribe_event.call_args_list
+                ]
+            ).described_as(
+                "Expected all the subscriptions of each device to be removed"
+            ).is_equal_to(
+                [(1,), (2,)]
+            )
+
+
+@pytest.mark.integration_tracer
+class TestTangoEventTracerClose:
+    """Unit tests for the `TangoEventTracer` teardown."""
+
+    @staticmethod
+    def test_context_manager_closes_tracer() -> None:
+        """The tracer unsubscribes and clears the events on exit."""
+        device_proxy = create_dev_proxy_mock("device1")
+        device_proxy.subscribe_event.return_value = 1
+
+        with TangoEventTracer() as tracer:
+            tracer.subscribe_event(device_proxy, "attr1")
+            add_event(tracer, "device1", 100)
+
+        device_proxy.unsubscribe_event.assert_called_once_with(1)
+        assert_that(tracer.events).described_as(
+            "Expected the events to be cleared on exit"
+        ).is_empty()
+
+    @staticmethod
+    def test_close_releases_waiting_queries() -> None:
+        """Closing the tracer unlocks the queries which are still waiting."""
+        tracer = TangoEventTracer()
+        results: list[list[ReceivedEvent]] = []
+        query_thread = threading.Thread(
+            target=lambda: results.append(
+                tracer.query_events(lambda _: False, timeout=10)
+            )
+        )
+
+        start_time = datetime.now()
+        query_thread.start()
+        while not tracer._pending_queries:  # pylint: disable=protected-access
+            time.sleep(0.01)
+        tracer.close()
+        query_thread.join(timeout=5)
+
+        assert_that(query_thread.is_alive()).described_as(
+            "Expected the waiting query to be released on close"
+        ).is_false()
+        assert_that(results).is_equal_to([[]])
+        assert_that(
+            (datetime.now() - start_time).total_seconds()
+        ).described_as(
+            "Expected the query to return well before its timeout"
+        ).is_less_than(
+            5
+        )
+
+
+@pytest.mark.integration_tracer
+class TestTangoEventTracerStoredEvents:
+    """Unit tests for the `TangoEventTracer` stored events."""
+
+    @staticmethod
+    def test_event_callback_drops_events_rejected_by_prefilter(
+        tracer: TangoEventTracer,
+    ) -> None:
+        """The event callback drops the events rejected by the prefilter.
+
+        :param tracer: The `TangoEventTracer` instance.
+        """
+        tracer.set_prefilter(lambda data: data.attr_value.value > 100)
+
+        # pylint: disable=protected-access
+        tracer._event_callback(
+            create_eventdata_mock("test_device", "test_attribute", 100)
+        )
+        tracer._event_callback(
+            create_eventdata_mock("test_device", "test_attribute", 200)
+        )
+
+        assert_that(
+            [event.attribute_value for event in tracer.events]
+        ).described_as(
+            "Event callback should store just the accepted events"
+        ).is_equal_to(
+            [200]
+        )
+
+    @staticmethod
+    def test_get_previous_event(tracer: TangoEventTracer) -> None:
+        """The previous event is the most recent one from the same source.
+
+        :param tracer: The `TangoEventTracer` instance.
+        """
+        # events are not stored in reception order
+        add_event(tracer, "device1", 100, 5, attr_name="attr")
+        add_event(tracer, "device1", 200, 15, attr_name="attr")
+        add_event(tracer, "device2", 300, 2, attr_name="attr")
+        add_event(tracer, "device1", 400, 10, attr_name="other_attr")
+        add_event(tracer, "device1", 500, 0, attr_name="Attr")
+
+        last_event = tracer.events[-1]
+        previous_event = tracer.get_previous_event(last_event)
+
+        assert_that(previous_event).described_as(
+            "Expected to find the event that precedes the last one"
+        ).is_not_none()
+        assert previous_event is not None
+        assert_that(previous_event.attribute_value).described_as(
+            "Expected the previous event to be the most recent one "
+            "from the same device and attribute"
+        ).is_equal_to(100)
+        assert_that(tracer.get_previous_event(tracer.events[1])).described_as(
+            "Expected no previous event for the oldest event"
+        ).is_none()
+
+    @staticmethod
+    def test_max_events_discards_oldest_events() -> None:
+        """A tracer with a maximum number of events discards the oldest."""
+        tracer = TangoEventTracer(max_events=2)
+
+        add_event(tracer, "device1", 100, 3)
+        add_event(tracer, "device1", 200, 2)
+        add_event(tracer, "device1", 300, 1)
+
+        assert_that(
+            [event.attribute_value for event in tracer.events]
+        ).described_as(
+            "Expected the oldest event to be discarded"
+        ).is_equal_to(
+            [200, 300]
+        )
+        assert_that(tracer.get_previous_event(tracer.events[0])).described_as(
+            "Expected a discarded event to be no more a previous event"
+        ).is_none()
+        assert_that(tracer.n_discarded_events).described_as(
+            "Expected the discarded event to be counted"
+        ).is_equal_to(1)
+
+    @staticmethod
+    def test_max_events_must_be_positive() -> None:
+        """A tracer cannot be created with a non positive maximum size."""
+        with pytest.raises(ValueError):
+            TangoEventTracer(max_events=0)
@@ -0,0 +1,394 @@
+"""Unit tests for the :py:class:`TangoEventTracer` query evaluation.
+
+This set of tests covers how the queries evaluate the stored and the
+new events (each event just once, or the whole history when requested),
+how they are narrowed to a source, how they behave when events are
+received while they start and how they are awaited in an event loop.
+"""
+
+import asyncio
+import threading
+import time
+from datetime import datetime
+from typing import Any, Sequence
+from unittest.mock import patch
+
+import pytest
+from assertpy import assert_that
+
+from ska_tango_testing.integration._event_store import EventStore
+from ska_tango_testing.integration._query_evaluator import QueryEvaluator
+from ska_tango_testing.integration.event import ReceivedEvent
+from ska_tango_testing.integration.tracer import TangoEventTracer
+
+from .testing_utils.populate_tracer import add_event, delayed_add_event
+
+
+@pytest.mark.integration_tracer
+class TestTangoEventTracerQueryEvaluation:
+    """Unit tests for the `TangoEventTracer` query evaluation."""
+
+    @staticmethod
+    def test_query_evaluates_each_event_just_once(
+        tracer: TangoEventTracer,
+    ) -> None:
+        """The query predicate is evaluated just once per event.
+
+        :param tracer: The `TangoEventTracer` instance.
+        """
+        add_event(tracer, "device1", 100, 5)
+        add_event(tracer, "device2", 100, 4)
+        add_event(tracer, "device2", 100, 3)
+        delayed_add_event(tracer, "device2", 100, 0.5)
+        delayed_add_event(tracer, "device1", 100, 1)
+
+        evaluated_events: list[ReceivedEvent] = []
+
+        def _predicate(event: ReceivedEvent) -> bool:
+            """Keep track of the evaluated events.
+
+            :param event: The event to evaluate.
+            :return: True if the event comes from device1.
+            """
+            evaluated_events.append(event)
+            return event.has_device("device1")
+
+        result = tracer.query_events(_predicate, timeout=5, target_n_events=2)
+
+        assert_that(result).described_as(
+            "Expected to find 2 events for 'device1'"
+        ).is_length(2)
+        assert_that(evaluated_events).described_as(
+            "Expected each event to be evaluated just once"
+        ).is_length(5)
+
+    @staticmethod
+    def test_query_events_with_event_received_while_starting(
+        tracer: TangoEventTracer,
+    ) -> None:
+        """An event received while a query starts is not lost.
+
+        The event arrives (from another thread) while the query is
+        evaluating the already stored events, so after the stored events
+        are taken but before the query waits for new ones.
+
+        :param tracer: The `TangoEventTracer` instance.
+        """
+        add_event(tracer, "device1", 100)
+        injector = threading.Thread(
+            target=add_event, args=(tracer, "device1", 200)
+        )
+
+        def _predicate(event: ReceivedEvent) -> bool:
+            """Match the new event, receiving it during the first call.
+
+            :param event: The event to evaluate.
+            :return: True if the event has the new value.
+            """
+            if not injector.is_alive() and len(tracer.events) == 1:
+                injector.start()
+                while len(tracer.events) == 1:
+                    time.sleep(0.01)
+            return event.attribute_value == 200
+
+        start_time = datetime.now()
+        result = tracer.query_events(_predicate, timeout=2)
+        injector.join()
+
+        assert_that([event.attribute_value for event in result]).described_as(
+            "Expected the event received while starting the query to match"
+        ).is_equal_to([200])
+        assert_that(
+            (datetime.now() - start_time).total_seconds()
+        ).described_as(
+            "Expected the query to be satisfied without waiting the timeout"
+        ).is_less_than(
+            1
+        )
+
+    @staticmethod
+    def test_query_events_evaluates_stored_events_first(
+        tracer: TangoEventTracer,
+    ) -> None:
+        """A starting query checks the stored events before the new ones.
+
+        A new event is received right after the query becomes pending,
+        while the stored events are going to be evaluated (slowly):
+        it is evaluated only after them, so the matching events keep
+        their reception order.
+
+        :param tracer: The `TangoEventTracer` instance.
+        """
+        add_event(tracer, "device1", 100)
+        injector = threading.Thread(
+            target=add_event, args=(tracer, "device1", 200)
+        )
+        evaluate_events = QueryEvaluator.evaluate_events
+
+        def _slow_first_evaluation(
+            query: QueryEvaluator, events: list[ReceivedEvent]
+        ) -> None:
+            """Receive a new event before evaluating the stored ones.
+
+            :param query: The evaluated query.
+            :param events: The events to evaluate.
+            """
+            if threading.current_thread() is not injector:
+                injector.start()
+                time.sleep(0.3)
+            evaluate_events(query, events)
+
+        with patch.object(
+            QueryEvaluator,
+            "evaluate_events",
+            autospec=True,
+            side_effect=_slow_first_evaluation,
+        ):
+            result = tracer.query_events(
+                lambda _: True, timeout=2, target_n_events=2
+            )
+        injector.join()
+
+        assert_that([event.attribute_value for event in result]).described_as(
+            "Expected the stored event to be matched before the new one"
+        ).is_equal_to([100, 200])
+
+    @staticmethod
+    def test_query_events_reevaluating_history(
+        tracer: TangoEventTracer,
+    ) -> None:
+        """A query can match events depending on later events.
+
+        The predicate matches an event A only if an event B follows it,
+        so A must be evaluated again when B is received.
+
+        :param tracer: The `TangoEventTracer` instance.
+        """
+
+        def _followed_by_b(event: ReceivedEvent) -> bool:
+            """Match an event A if it is followed by an event B.
+
+            :param event: The event to evaluate.
+            :return: True if the event is A and a B is received later.
+            """
+            return event.attribute_value == "A" and any(
+                other.attribute_value == "B"
+                and other.reception_time >= event.reception_time
+                for other in tracer.events
+            )
+
+        delayed_add_event(tracer, "device1", "A", 0.1)
+        delayed_add_event(tracer, "device1", "B", 0.3)
+        start_time = datetime.now()
+
+        result = tracer.query_events(
+            _followed_by_b, timeout=2, reevaluates_history=True
+        )
+
+        assert_that([event.attribute_value for event in result]).described_as(
+            "Expected the event A to match once B is received"
+        ).is_equal_to(["A"])
+        assert_that(
+            (datetime.now() - start_time).total_seconds()
+        ).described_as(
+            "Expected the query to be satisfied when B is received"
+        ).is_less_than(
+            1.5
+        )
+
+    @staticmethod
+    def test_query_events_reevaluating_history_keeps_the_newest(
+        tracer: TangoEventTracer,
+    ) -> None:
+        """An older history never overwrites the evaluation of a newer one.
+
+        Two events are received concurrently: the history taken for the
+        first one must not replace the results of the (newer) history
+        taken for the second one, even if it is evaluated later.
+
+        :param tracer: The `TangoEventTracer` instance.
+        """
+        add_event(tracer, "device1", 100)
+        second_event = threading.Thread(
+            target=add_event, args=(tracer, "device1", 300)
+        )
+        first_event = threading.Thread(
+            target=add_event, args=(tracer, "device1", 200)
+        )
+        get_events = EventStore.get_events
+
+        def _slow_history(
+            store: EventStore, *args: Any, **kwargs: Any
+        ) -> Sequence[ReceivedEvent]:
+            """Receive the second event after taking the first history.
+
+            :param store: The event store.
+            :param args: The positional arguments of the method.
+            :param kwargs: The keyword arguments of the method.
+            :return: The stored events.
+            """
+            events = get_events(store, *args, **kwargs)
+            if threading.current_thread() is first_event:
+                second_event.start()
+                time.sleep(0.3)
+            return events
+
+        results: list[list[ReceivedEvent]] = []
+        query_thread = threading.Thread(
+            target=lambda: results.append(
+                tracer.query_events(
+                    lambda _: True,
+                    timeout=1,
+                    target_n_events=4,
+                    reevaluates_history=True,
+                )
+            )
+        )
+        query_thread.start()
+        while not tracer._pending_queries:  # pylint: disable=protected-access
+            time.sleep(0.01)
+
+        with patch.object(
+            EventStore,
+            "get_events",
+            autospec=True,
+            side_effect=_slow_history,
+        ):
+            first_event.start()
+            first_event.join()
+            second_event.join()
+        query_thread.join()
+
+        assert_that(
+            [event.attribute_value for event in results[0]]
+        ).described_as(
+            "Expected the results of the newest history (all the events)"
+        ).is_equal_to(
+            [100, 200, 300]
+        )
+
+    @staticmethod
+    def test_query_events_narrowed_to_a_source(
+        tracer: TangoEventTracer,
+    ) -> None:
+        """A query narrowed to a source skips the events from other sources.
+
+        :param tracer: The `TangoEventTracer` instance.
+        """
+        add_event(tracer, "device1", 100, 5)
+        add_event(tracer, "device1", 200, 4, attr_name="other_attr")
+        add_event(tracer, "device2", 300, 3)
+        delayed_add_event(tracer, "device1", 400, 0.5)
+
+        evaluated_events: list[ReceivedEvent] = []
+
+        def _predicate(event: ReceivedEvent) -> bool:
+            """Keep track of the evaluated events.
+
+            :param event: The event to evaluate.
+            :return: Always True.
+            """
+            evaluated_events.append(event)
+            return True
+
+        result = tracer.query_events(
+            _predicate,
+            timeout=5,
+            target_n_events=2,
+            device_name="device1",
+            attribute_name="Test_Attribute",
+        )
+
+        assert_that([event.attribute_value for event in result]).described_as(
+            "Expected to find just the events from the given source"
+        ).is_equal_to([100, 400])
+        assert_that(evaluated_events).described_as(
+            "Expected the predicate to be evaluated just on the events "
+            "from the given source"
+        ).is_length(2)
+
+
+@pytest.mark.integration_tracer
+class TestTangoEventTracerAsyncQueries:
+    """Unit tests for the `TangoEventTracer` asynchronous queries."""
+
+    @staticmethod
+    def test_query_events_async_with_delayed_event(
+        tracer: TangoEventTracer,
+    ) -> None:
+        """The async query awaits an event that occurs after a delay.
+
+        :param tracer: The `TangoEventTracer` instance.
+        """
+        delayed_add_event(tracer, "device1", 100, 0.5)
+
+        start_time = datetime.now()
+        result = asyncio.run(
+            tracer.query_events_async(
+                lambda e: e.has_device("device1"), timeout=5
+            )
+        )
+
+        assert_that(result).described_as(
+            "Expected to find a matching event for 'device1' "
+            "within the timeout"
+        ).is_length(1)
+        assert_that(
+            (datetime.now() - start_time).total_seconds()
+        ).described_as(
+            "The query should be unlocked as soon as the event occurs"
+        ).is_less_than(
+            2
+        )
+
+    @staticmethod
+    def test_query_events_async_reevaluating_history(
+        tracer: TangoEventTracer,
+    ) -> None:
+        """The async query can match events depending on later events.
+
+        :param tracer: The `TangoEventTracer` instance.
+        """
+
+        def _followed_by_b(event: ReceivedEvent) -> bool:
+            """Match an event A if it is followed by an event B.
+
+            :param event: The event to evaluate.
+            :return: True if the event is A and a B is received later.
+            """
+            return event.attribute_value == "A" and any(
+                other.attribute_value == "B"
+                and other.reception_time >= event.reception_time
+                for other in tracer.events
+            )
+
+        delayed_add_event(tracer, "device1", "A", 0.1)
+        delayed_add_event(tracer, "device1", "B", 0.3)
+
+        result = asyncio.run(
+            tracer.query_events_async(
+                _followed_by_b, timeout=2, reevaluates_history=True
+            )
+        )
+
+        assert_that([event.attribute_value for event in result]).described_as(
+            "Expected the event A to match once B is received"
+        ).is_equal_to(["A"])
+
+    @staticmethod
+    def test_query_events_async_timeout(tracer: TangoEventTracer) -> None:
+        """The async query returns no events when the timeout is reached.
+
+        :param tracer: The `TangoEventTracer` instance.
+        """
+        add_event(tracer, "device2", 100, 1)
+
+        result = asyncio.run(
+            tracer.query_events_async(
+                lambda e: e.has_device("device1"), timeout=0.5
+            )
+        )
+
+        assert_that(result).described_as(
+            "Expected no matching events for 'device1'"
+        ).is_empty()
@@ -1,4 +1,6 @@
 """Typed events behave like normal events, but with a typed attribute value."""
+from datetime import datetime
+
 import pytest
 from assertpy import assert_that
 
@@ -81,6 +83,22 @@ class TestTypedEvents:
         assert_that(typed_event.attribute_value).is_equal_to(1)
         assert_that(str(typed_event.attribute_value)).is_equal_to("1")
 
+    @staticmethod
+    def test_event_enum_mapper_keeps_reception_time() -> None:
+        """The TypedEvent keeps the reception time of the original event."""
+        event_data = create_eventdata_mock("test/device/1", "state", 1)
+        normal_event = ReceivedEvent(event_data)
+        normal_event.reception_time = datetime(2024, 1, 1)
+
+        mapper = EventEnumMapper({"STATE": DummyStateEnum})
+
+        typed_event = mapper.get_typed_event(normal_event)
+
+        assert_that(typed_event).is_instance_of(TypedEvent)
+        assert_that(typed_event.reception_time).is_equal_to(
+            datetime(2024, 1, 1)
+        )
+
     @staticmethod
     def test_event_enum_mapper_raises_error_on_invalid_enum() -> None:
         """The EventEnumMapper raises an error on invalid enum."""
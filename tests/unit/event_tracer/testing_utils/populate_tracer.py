@@ -35,7 +35,7 @@ def add_event(
             seconds=seconds_ago
         )
 
-    tracer._add_event(test_event)  # pylint: disable=protected-access
+    tracer.inject_event(test_event)
 
 
 def delayed_add_event(
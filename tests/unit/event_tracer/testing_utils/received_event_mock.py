@@ -25,6 +25,7 @@ def create_dummy_event(
     event = MagicMock(spec=ReceivedEvent)
     event.device_name = device_name
     event.attribute_name = attribute_name
+    event.attribute_key = attribute_name.lower()
     event.attribute_value = attribute_value
     event.reception_time = datetime.now() - timedelta(seconds=seconds_ago)
     event.has_device = (